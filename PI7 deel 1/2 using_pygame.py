@@ -1,3 +1,4 @@
+#step 2, kept as it was written to show how the game was built, the current game is "6 Zobrist transposition table.py"
 import pygame
 import pygame.freetype
 import constants
@@ -1,3 +1,5 @@
+#step 4, kept as it was written to show how the game was built, the AI searches on the game loop and the board is drawn every frame.
+#The current game is "6 Zobrist transposition table.py", it searches in the background and only draws what changed
 import pygame
 import pygame.freetype
 import constants
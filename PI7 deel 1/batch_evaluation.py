@@ -0,0 +1,256 @@
+import argparse
+import random
+import time
+import numpy as np
+import constants
+import engine
+
+RAY_SQUARES = {} #(rows, cols) -> table of the squares along every ray, built the first time a board of that size is evaluated
+
+def games_to_arrays(games: list) -> tuple:
+    """
+    Convert games to the arrays the batch functions take.
+
+    parameters:
+    - games (list): The Game states
+
+    Returns:
+    - tuple: (boards, queens, turns) where boards is an N x ROWS x COLS int8 array of constants.EMPTY, constants.PLAYER1,
+             constants.PLAYER2 and constants.DESTROYED, queens is an N x 2 x 2 array with the (x_axis, y_axis) of player 1
+             and player 2 and turns is an array of the players to move
+    """
+    squares = constants.ROWS * constants.COLS
+    boards = np.zeros((len(games), squares), dtype=np.int8)
+    queens = np.zeros((len(games), 2, 2), dtype=np.int64)
+    turns = np.zeros(len(games), dtype=np.int8)
+    for index, game in enumerate(games):
+        #one pass over the bits instead of calling get_square for every square
+        for player, mask in ((constants.PLAYER1, game.queens[constants.PLAYER1]), (constants.PLAYER2, game.queens[constants.PLAYER2]), (constants.DESTROYED, game.destroyed)):
+            while mask:
+                bit = mask & -mask
+                boards[index, bit.bit_length() - 1] = player
+                mask ^= bit
+        queens[index] = game.positions[constants.PLAYER1], game.positions[constants.PLAYER2]
+        turns[index] = game.turn
+    return boards.reshape(len(games), constants.ROWS, constants.COLS), queens, turns
+
+def pack_boards(empty: np.ndarray) -> np.ndarray:
+    """
+    Pack boards into bitmasks, bit x_axis * constants.COLS + y_axis is set if square (x_axis, y_axis) is empty like Game.empty.
+    Only boards up to 64 squares fit in the uint64 words.
+
+    parameters:
+    - empty (np.ndarray): N x ROWS x COLS bool array, True if the square is empty
+
+    Returns:
+    - np.ndarray: Array of N uint64 bitmasks of the empty squares
+    """
+    squares = constants.ROWS * constants.COLS
+    if squares > 64:
+        raise ValueError(f"a {constants.ROWS}x{constants.COLS} board does not fit in 64 bits")
+    bits = np.zeros((len(empty), 64), dtype=bool)
+    bits[:, :squares] = empty.reshape(len(empty), squares)
+    #packing from the lowest bit into little endian bytes puts the squares in bit order
+    return np.packbits(bits, axis=1, bitorder="little").view("<u8").reshape(-1)
+
+def unpack_boards(empty: np.ndarray) -> np.ndarray:
+    """
+    Unpack bitmasks made by pack_boards or taken from Game.empty.
+
+    parameters:
+    - empty (np.ndarray): Array of N uint64 bitmasks of the empty squares
+
+    Returns:
+    - np.ndarray: N x ROWS x COLS bool array, True if the square is empty
+    """
+    squares = constants.ROWS * constants.COLS
+    words = np.ascontiguousarray(empty, dtype="<u8")
+    bits = np.unpackbits(words.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    return bits[:, :squares].astype(bool).reshape(-1, constants.ROWS, constants.COLS)
+
+def mobility_bitboards(empty: np.ndarray, queens: np.ndarray) -> np.ndarray:
+    """
+    Count the available moves of both queens of every board at once on bitboards of up to 64 squares.
+    The queens are shifted one step at a time in every direction like engine.neighbours does, a queen moves from one square
+    in a direction, so after every step a ray holds at most one bit and is counted if it is not 0.
+
+    parameters:
+    - empty (np.ndarray): Array of N uint64 bitmasks of the empty squares
+    - queens (np.ndarray): N x 2 x 2 array with the (x_axis, y_axis) of player 1 and player 2
+
+    Returns:
+    - np.ndarray: N x 2 array with the number of available moves of player 1 and player 2
+    """
+    squares = (queens[:, :, 0] * constants.COLS + queens[:, :, 1]).astype(np.uint64)
+    queen_bits = np.left_shift(np.uint64(1), squares)
+    empty = np.asarray(empty, dtype=np.uint64)[:, None]
+    moves = np.zeros(queen_bits.shape, dtype=np.int64)
+    for x_step, y_step in engine.DIRECTIONS:
+        shift = x_step * constants.COLS + y_step
+        #a step to a higher or lower y_axis may not wrap around to the next x_axis
+        if y_step == 1:
+            edge = np.uint64(engine.NOT_LAST_Y_AXIS)
+        elif y_step == -1:
+            edge = np.uint64(engine.NOT_FIRST_Y_AXIS)
+        else:
+            edge = np.uint64(engine.BOARD_MASK)
+        ray = queen_bits
+        for step in range(max(constants.ROWS, constants.COLS) - 1):
+            ray = ray & edge
+            ray = ray << np.uint64(shift) if shift > 0 else ray >> np.uint64(-shift)
+            ray &= empty
+            is_open = ray != 0
+            if not is_open.any():
+                break
+            moves += is_open
+    return moves
+
+def ray_squares() -> np.ndarray:
+    """
+    Get for every square, direction and step the square a queen reaches, or constants.ROWS * constants.COLS once the ray has left the board.
+
+    Returns:
+    - np.ndarray: ROWS * COLS x 8 x (max(ROWS, COLS) - 1) array of square indexes
+    """
+    key = (constants.ROWS, constants.COLS)
+    if key not in RAY_SQUARES:
+        squares, steps = constants.ROWS * constants.COLS, max(constants.ROWS, constants.COLS) - 1
+        table = np.full((squares, len(engine.DIRECTIONS), steps), squares, dtype=np.int64)
+        for square, (x_axis, y_axis) in enumerate(engine.SQUARES):
+            for direction, (x_step, y_step) in enumerate(engine.DIRECTIONS):
+                for step in range(steps):
+                    dest_x_axis, dest_y_axis = x_axis + x_step * (step + 1), y_axis + y_step * (step + 1)
+                    if not (0 <= dest_x_axis < constants.ROWS and 0 <= dest_y_axis < constants.COLS):
+                        break
+                    table[square, direction, step] = dest_x_axis * constants.COLS + dest_y_axis
+        RAY_SQUARES[key] = table
+    return RAY_SQUARES[key]
+
+def mobility_rays(empty: np.ndarray, queens: np.ndarray) -> np.ndarray:
+    """
+    Count the available moves of both queens of every board at once on boards of any size.
+    The squares along every ray of every queen are looked up in one pass, a ray stays open until the first square that is not empty.
+
+    parameters:
+    - empty (np.ndarray): N x ROWS x COLS bool array, True if the square is empty
+    - queens (np.ndarray): N x 2 x 2 array with the (x_axis, y_axis) of player 1 and player 2
+
+    Returns:
+    - np.ndarray: N x 2 array with the number of available moves of player 1 and player 2
+    """
+    count, squares = len(empty), constants.ROWS * constants.COLS
+    #every board gets an extra square that is not empty, the rays that left the board point to it
+    flat_empty = np.zeros((count, squares + 1), dtype=bool)
+    flat_empty[:, :squares] = empty.reshape(count, squares)
+    board_offsets = (np.arange(count, dtype=np.int64) * (squares + 1))[:, None, None, None]
+    rays = ray_squares()[queens[:, :, 0] * constants.COLS + queens[:, :, 1]]
+    cells = np.take(flat_empty.reshape(-1), rays + board_offsets)
+    return np.logical_and.accumulate(cells, axis=3).sum(axis=(2, 3))
+
+def mobility_batch(boards: np.ndarray, queens: np.ndarray) -> np.ndarray:
+    """
+    Count the available moves of both queens of every board at once, on bitboards if the board fits in 64 bits.
+
+    parameters:
+    - boards (np.ndarray): N x ROWS x COLS array of what is on every square, or N uint64 bitmasks of the empty squares
+    - queens (np.ndarray): N x 2 x 2 array with the (x_axis, y_axis) of player 1 and player 2
+
+    Returns:
+    - np.ndarray: N x 2 array with the number of available moves of player 1 and player 2
+    """
+    queens = np.asarray(queens, dtype=np.int64)
+    if boards.ndim == 1:
+        return mobility_bitboards(boards, queens)
+    empty = boards == constants.EMPTY
+    if constants.ROWS * constants.COLS <= 64:
+        return mobility_bitboards(pack_boards(empty), queens)
+    return mobility_rays(empty, queens)
+
+def evaluate_batch(boards: np.ndarray, queens: np.ndarray, turns: np.ndarray) -> tuple:
+    """
+    Evaluate boards at once for the player to move, with the same result as Game.evaluate(game.turn).
+    This is the score MiniMax returns at max_depth, the endgame solver MiniMax runs for queens that are cut off is not part of it.
+
+    parameters:
+    - boards (np.ndarray): N x ROWS x COLS array of what is on every square, or N uint64 bitmasks of the empty squares
+    - queens (np.ndarray): N x 2 x 2 array with the (x_axis, y_axis) of player 1 and player 2
+    - turns (np.ndarray): Array of the N players to move
+
+    Returns:
+    - tuple: (winners, scores, mobility) where winners is constants.EMPTY for boards that are not over,
+             scores is constants.WINNING_SCORE or -constants.WINNING_SCORE for boards that are over and the mobility difference otherwise,
+             mobility is an N x 2 array with the number of available moves of player 1 and player 2
+    """
+    mobility = mobility_batch(boards, queens)
+    turns = np.asarray(turns)
+    is_player2 = turns == constants.PLAYER2
+    moves = np.where(is_player2, mobility[:, 1], mobility[:, 0])
+    other_moves = np.where(is_player2, mobility[:, 0], mobility[:, 1])
+    other_players = np.where(is_player2, constants.PLAYER1, constants.PLAYER2)
+
+    #a player without moves has lost, the player to move is checked first like in Game.evaluate
+    winners = np.where(moves == 0, other_players, np.where(other_moves == 0, turns, constants.EMPTY)).astype(np.int8)
+    scores = np.where(moves == 0, -constants.WINNING_SCORE, np.where(other_moves == 0, constants.WINNING_SCORE, moves - other_moves))
+    return winners, scores, mobility
+
+def random_positions(count: int, seed: int) -> list:
+    """
+    Collect the positions of random games, every position of a game is kept until there are enough.
+
+    parameters:
+    - count (int): The number of positions
+    - seed (int): The seed of the random moves
+
+    Returns:
+    - list: The Game states
+    """
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        game = engine.start_game()
+        while len(positions) < count:
+            positions.append(game.copy())
+            moves = game.available_moves()
+            if not moves:
+                break
+            player_x_axis, player_y_axis = game.getplayer()
+            game.move(player_x_axis, player_y_axis, *rng.choice(moves))
+    return positions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the batch evaluation with Game.evaluate on random positions and measure its speed.")
+    parser.add_argument("--positions", type=int, default=100000, help="number of random positions")
+    parser.add_argument("--seed", type=int, default=constants.SEED, help="seed of the random games")
+    parser.add_argument("--size", default=f"{constants.ROWS}x{constants.COLS}", help="board size as ROWSxCOLS")
+    arguments = parser.parse_args()
+    engine.set_board_size(*engine.parse_board_size(arguments.size))
+
+    games = random_positions(arguments.positions, arguments.seed)
+    boards, queens, turns = games_to_arrays(games)
+
+    start = time.perf_counter()
+    expected = [game.evaluate(game.turn)[:2] for game in games]
+    python_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    winners, scores, mobility = evaluate_batch(boards, queens, turns)
+    batch_seconds = time.perf_counter() - start
+
+    mismatches = sum(1 for index, (winner, score) in enumerate(expected) if winner != winners[index] or score != scores[index])
+    print(f"{len(games)} positions on a {constants.ROWS}x{constants.COLS} board, {mismatches} mismatches with Game.evaluate")
+    print(f"  Game.evaluate: {python_seconds:.3f}s, {len(games) / python_seconds:.0f} positions/s")
+    print(f"  evaluate_batch: {batch_seconds:.3f}s, {len(games) / batch_seconds:.0f} positions/s")
+
+    #the ray lookups are used for boards beyond 64 squares, on smaller boards they are checked against the bitboards
+    start = time.perf_counter()
+    ray_mobility = mobility_rays(boards == constants.EMPTY, queens)
+    ray_seconds = time.perf_counter() - start
+    print(f"  mobility_rays: {ray_seconds:.3f}s, {len(games) / ray_seconds:.0f} positions/s, {np.count_nonzero(ray_mobility != mobility)} mismatches")
+
+    if constants.ROWS * constants.COLS <= 64:
+        empty = np.array([game.empty for game in games], dtype=np.uint64)
+        start = time.perf_counter()
+        packed_winners, packed_scores, packed_mobility = evaluate_batch(empty, queens, turns)
+        packed_seconds = time.perf_counter() - start
+        mismatches = np.count_nonzero((packed_winners != winners) | (packed_scores != scores))
+        print(f"  evaluate_batch on bit-packed boards: {packed_seconds:.3f}s, {len(games) / packed_seconds:.0f} positions/s, {mismatches} mismatches")
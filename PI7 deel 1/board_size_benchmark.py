@@ -0,0 +1,86 @@
+import argparse
+import random
+import time
+import tracemalloc
+import constants
+import engine
+
+def play(depth: int, moves: int, seed: int) -> tuple:
+    """
+    Play the first moves of a game on the board size that is set, with a fixed depth search, starting with a random move for both players.
+
+    parameters:
+    - depth (int): The depth every move is searched to
+    - moves (int): The number of moves that are searched, the game ends earlier if a player is stuck
+    - seed (int): The seed of the random first moves
+
+    Returns:
+    - tuple: (searches, seconds, nodes) the number of searched moves and the time and nodes they took together
+    """
+    game = engine.start_game()
+    transition_table = engine.TranspositionTable()
+    ordering = engine.MoveOrdering()
+
+    rng = random.Random(seed)
+    for move in range(2):
+        player_x_axis, player_y_axis = game.getplayer()
+        game.move(player_x_axis, player_y_axis, *rng.choice(game.available_moves()))
+
+    searches, seconds, nodes = 0, 0.0, 0
+    while searches < moves and not game.is_game_over():
+        transition_table.new_search()
+        ordering.new_search()
+        game.nodes = 0
+        start = time.perf_counter()
+        best_move, reached = engine.iterative_deepening(game, transition_table, game.turn, float("inf"), ordering, constants.PVS, depth_limit=depth)
+        seconds += time.perf_counter() - start
+        nodes += game.nodes
+        searches += 1
+        player_x_axis, player_y_axis = game.getplayer()
+        game.move(player_x_axis, player_y_axis, best_move[0], best_move[1])
+    return searches, seconds, nodes
+
+def benchmark_size(rows: int, cols: int, depth: int, moves: int, seed: int) -> dict:
+    """
+    Measure the time per move and the memory of a board size.
+    The search depth is fixed instead of the time, so the time per move shows how the work grows with the board.
+    The memory is measured in a separate run, because tracing the allocations slows the search down.
+
+    parameters:
+    - rows (int): The number of x_axis coordinates
+    - cols (int): The number of y_axis coordinates
+    - depth (int): The depth every move is searched to
+    - moves (int): The number of moves that are searched
+    - seed (int): The seed of the random first moves
+
+    Returns:
+    - dict: The measurements of the board size
+    """
+    tracemalloc.start()
+    engine.set_board_size(rows, cols)
+    tables = tracemalloc.get_traced_memory()[0]
+    play(depth, moves, seed)
+    #the transposition table has a fixed size, the memory that is left is mostly the ray lookups filled in by the search
+    memory, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    engine.set_board_size(rows, cols)
+    setup = time.perf_counter() - start
+    searches, seconds, nodes = play(depth, moves, seed)
+    return {"size": f"{rows}x{cols}", "squares": rows * cols, "setup": setup, "tables": tables, "memory": memory, "peak": peak,
+            "seconds": seconds / searches if searches else 0, "nodes": nodes / searches if searches else 0, "nps": nodes / seconds if seconds else 0}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure how the time per move and the memory grow with the board size.")
+    parser.add_argument("--sizes", nargs="+", default=["6x6", "7x7", "8x8", "10x10"], help="board sizes as ROWSxCOLS")
+    parser.add_argument("--depth", type=int, default=4, help="depth every move is searched to")
+    parser.add_argument("--moves", type=int, default=6, help="number of moves searched on every board")
+    parser.add_argument("--seed", type=int, default=constants.SEED, help="seed of the random first moves")
+    arguments = parser.parse_args()
+
+    print(f"{'size':>6} {'squares':>7} {'setup':>7} {'tables':>9} {'memory':>9} {'peak':>9} {'s/move':>8} {'nodes/move':>10} {'nodes/s':>8}")
+    for size in arguments.sizes:
+        result = benchmark_size(*engine.parse_board_size(size), arguments.depth, arguments.moves, arguments.seed)
+        print(f"{result['size']:>6} {result['squares']:>7} {result['setup']:>6.2f}s {result['tables'] / 2**20:>7.1f}MB {result['memory'] / 2**20:>7.1f}MB "
+              f"{result['peak'] / 2**20:>7.1f}MB {result['seconds']:>8.3f} {result['nodes']:>10.0f} {result['nps']:>8.0f}")
@@ -1,15 +1,67 @@
-import pygame
-
 #Game settings
 WIDTH, HEIGHT = 600, 600
 ROWS, COLS = 6, 6
-SQUARE_SIZE = WIDTH//COLS
+
+def square_sizes(rows: int, cols: int) -> tuple:
+    """
+    Get the size of a square and of the queen image on a board that fills the window.
+
+    parameters:
+    - rows (int): The number of x_axis coordinates
+    - cols (int): The number of y_axis coordinates
+
+    Returns:
+    - tuple: (square_size, queen_size) in pixels
+    """
+    square_size = min(WIDTH // rows, HEIGHT // cols) #x_axis runs along the width and y_axis along the height
+    return square_size, square_size * 33 // 10 #the queen image is larger than a square
+
+SQUARE_SIZE, QUEEN_SIZE = square_sizes(ROWS, COLS)
 FPS = 60
+EVENT_DRIVEN = True #the game loop sleeps until something happens instead of running at FPS frames per second
 MAX_DEPTH = 4
+MOVE_TIME = 1.0 #seconds the AI may search for a move with iterative deepening
+PVS = True #search with principal variation search, the moves after the first are searched with a null window
+ENDGAME_MAX_REGION = 12 #once the queens are cut off from each other, regions up to this many squares are solved exactly
+ENDGAME_CACHE_SIZE = 2**16 #longest paths kept between searches, about 8 MB
+WORKERS = 1 #number of processes the root moves are split over, 1 searches in the game process itself
+WORKER_TABLES = 2 #transposition tables a worker keeps, one per engine that shares the pool, the oldest is dropped first
+PONDER = True #search the replies of the human while the human thinks
+PONDER_REPLIES = 8 #replies that are pondered, the expected reply and the ones that leave the human the most moves
+PONDER_SLICE = 0.25 #seconds the ponder searches between checks whether the human has moved
+PONDER_TIME = 20.0 #most seconds pondered while the human thinks, so the ponder does not keep a core busy
+SEARCH_STATS = False #print nodes per ply, cutoffs, transposition table use and timings after every AI move
+ASPIRATION_WINDOW = 3 #iterative deepening searches with a window of this size around the score of the previous iteration
 WINNING_SCORE = 100
 DEFAULT_BEST_SCORE = 1000
 SEED = 0
 
+#Transposition table bound types, negating a bound gives the bound for the other player
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = -1
+
+#Transposition table size and replacement policy
+TT_SIZE = 2**18 #number of entries, memory stays fixed at about 15 bytes per entry
+TT_BUCKET_SIZE = 4 #entries per bucket, a position can be stored in any entry of its bucket
+DEPTH_PREFERRED = "depth-preferred" #deeper entries are kept, the last entry of a bucket is always replaced
+ALWAYS_REPLACE = "always-replace" #the least valuable entry of the bucket is always replaced
+TT_REPLACEMENT = DEPTH_PREFERRED
+TT_FILE = "transition_table.bin" #binary file the table is stored in between games, the board size is added to the name: transition_table_6x6.bin
+TT_FILE_SIZE = 2**20 #maximum number of records in the file, the deepest entries are kept
+OPENING_BOOK = "opening_book.bin" #best moves of the first plies, built by opening_book.py in the layout of a transposition table file, named per board size like TT_FILE
+
+#Search engines, the AI searches with MiniMax or with Monte Carlo tree search
+MINIMAX = "minimax"
+MCTS = "mcts"
+AI_ENGINE = MINIMAX
+MCTS_PLAYOUTS = 0 #playouts per move, 0 to play out until the time budget runs out
+MCTS_PONDER_PLAYOUTS = 100000 #most playouts pondered while the human thinks, so the tree does not grow without end
+MCTS_EXPLORATION = 1.4 #UCT exploration constant, higher values try the less visited moves more often
+RANDOM_PLAYOUT = "random" #every move of a playout is random
+MOBILITY_PLAYOUT = "mobility" #every move of a playout is the one of two random moves that leaves the other player the fewest moves
+MCTS_PLAYOUT_POLICY = MOBILITY_PLAYOUT
+
 #Player settings
 EMPTY = 0
 PLAYER1 = 1
@@ -30,4 +82,3 @@ SEMI_GREEN_WHITE = (127, 255, 127)
 
 #Images
 QUEEN = "../chess-queen.svg"
-QUEEN_SIZE = 330
@@ -0,0 +1,2112 @@
+import constants
+import math
+import random
+import mmap
+import os
+import struct
+import time
+import itertools
+import multiprocessing
+import threading
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
+
+#the board is stored as bitboards: square (x_axis, y_axis) is bit x_axis * constants.COLS + y_axis
+BOARD_MASK = (1 << (constants.ROWS * constants.COLS)) - 1 #6x6 board fits in a single 64-bit word
+
+def square_bit(x_axis: int, y_axis: int) -> int:
+    """
+    Get the bitboard bit for a square.
+    
+    parameters:
+    - x_axis (int): x_axis-coordinate of the square
+    - y_axis (int): y_axis-coordinate of the square
+
+    Returns:
+    - int: Bitmask with only the bit of the square set
+    """
+    return 1 << (x_axis * constants.COLS + y_axis)
+
+def initialize_between_masks() -> list:
+    """
+    Precompute for every pair of squares the mask of the squares between them.
+    
+    parameters:
+    - None
+
+    Returns:
+    - list: between_masks[origin][dest] is the mask of the squares between origin and dest, None if they are not on the same row, column or diagonal
+    """
+    squares = constants.ROWS * constants.COLS
+    between_masks = [[None for dest in range(squares)] for origin in range(squares)]
+    for origin in range(squares):
+        player_x_axis, player_y_axis = divmod(origin, constants.COLS)
+        for dest in range(squares):
+            dest_x_axis, dest_y_axis = divmod(dest, constants.COLS)
+            if origin == dest or ((player_x_axis != dest_x_axis and player_y_axis != dest_y_axis) and (abs(player_x_axis - dest_x_axis) != abs(player_y_axis - dest_y_axis))):
+                continue
+            step_x_axis = (dest_x_axis > player_x_axis) - (dest_x_axis < player_x_axis)
+            step_y_axis = (dest_y_axis > player_y_axis) - (dest_y_axis < player_y_axis)
+            path = 0
+            for i in range(1, max(abs(player_x_axis - dest_x_axis), abs(player_y_axis - dest_y_axis))):
+                path |= square_bit(player_x_axis + i * step_x_axis, player_y_axis + i * step_y_axis)
+            between_masks[origin][dest] = path
+    return between_masks
+
+BETWEEN_MASKS = initialize_between_masks()
+
+#the 8 directions a queen can move in as (x_axis step, y_axis step)
+DIRECTIONS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+class RayMoves(dict):
+    def __init__(self, ray: list):
+        """
+        Lookup of the reachable squares on a ray, indexed by the empty squares on the ray.
+        An entry is computed the first time its occupancy is looked up, so large boards don't pay for every occupancy up front.
+        
+        parameters:
+        - ray (list): The squares of the ray as (x_axis, y_axis), closest square first
+        """
+        super().__init__()
+        self.ray = [(square_bit(dest_x_axis, dest_y_axis), (dest_x_axis, dest_y_axis)) for dest_x_axis, dest_y_axis in ray]
+        
+    def __missing__(self, empty: int) -> tuple:
+        """
+        Compute the squares up to the first square on the ray that is not empty.
+        
+        parameters:
+        - empty (int): The empty squares on the ray
+
+        Returns:
+        - tuple: The reachable squares as (x_axis, y_axis)
+        """
+        reachable = []
+        for bit, square in self.ray:
+            if not empty & bit:
+                break
+            reachable.append(square)
+        self[empty] = reachable = tuple(reachable)
+        return reachable
+
+def initialize_ray_tables() -> list:
+    """
+    Precompute for every square the rays in the 8 queen directions.
+    Every ray gets a lookup indexed by the empty squares on that ray, which gives the reachable squares in that direction.
+    
+    parameters:
+    - None
+
+    Returns:
+    - list: ray_tables[origin] is a list of (ray_mask, ray_moves) tuples, one for every direction that is not off the board,
+            where ray_moves[empty & ray_mask] is a tuple of the reachable squares as (x_axis, y_axis)
+    """
+    ray_tables = []
+    for origin in range(constants.ROWS * constants.COLS):
+        player_x_axis, player_y_axis = divmod(origin, constants.COLS)
+        rays = []
+        for step_x_axis, step_y_axis in DIRECTIONS:
+            #walk from the origin to the edge of the board, closest square first
+            ray = []
+            dest_x_axis, dest_y_axis = player_x_axis + step_x_axis, player_y_axis + step_y_axis
+            while 0 <= dest_x_axis < constants.ROWS and 0 <= dest_y_axis < constants.COLS:
+                ray.append((dest_x_axis, dest_y_axis))
+                dest_x_axis, dest_y_axis = dest_x_axis + step_x_axis, dest_y_axis + step_y_axis
+            if not ray:
+                continue
+            
+            #the reachable squares of an occupancy of the ray are filled in the first time it is looked up
+            ray_mask = 0
+            for dest_x_axis, dest_y_axis in ray:
+                ray_mask |= square_bit(dest_x_axis, dest_y_axis)
+            rays.append((ray_mask, RayMoves(ray)))
+        ray_tables.append(rays)
+    return ray_tables
+
+RAY_TABLES = initialize_ray_tables()
+
+def initialize_zobrist_keys() -> tuple:
+    """
+    Initialize the Zobrist keys for the game board.
+    The keys are kept in a flat list, the key of a piece on a square is at index square * 3 + piece - 1.
+    The keys are drawn from constants.SEED, so the same seed always gives the same hashes.
+    
+    parameters:
+    - None
+    
+    returns:
+    - tuple: (zobrist_keys, turn_key) where turn_key is XORed in while player 1 is to move
+    """
+    generator = random.Random(constants.SEED)
+    zobrist_keys = [generator.randint(0, 2**64 - 1) for key in range(constants.ROWS * constants.COLS * 3)] #The 3 stands for the 3 possible pieces: player 1, player 2, destroyed
+    #the turn key tells the positions with player 1 to move apart from the same positions with player 2 to move
+    turn_key = generator.randint(0, 2**64 - 1)
+    return zobrist_keys, turn_key
+
+ZOBRIST_KEYS, ZOBRIST_TURN_KEY = initialize_zobrist_keys()
+
+#(x_axis, y_axis) of every square index, used to decode moves stored as a square index
+SQUARES = [divmod(square, constants.COLS) for square in range(constants.ROWS * constants.COLS)]
+
+#masks of the squares that have a neighbour at a higher or lower y_axis, so shifting by 1 does not wrap to the next x_axis
+NOT_LAST_Y_AXIS = sum(square_bit(x_axis, y_axis) for x_axis in range(constants.ROWS) for y_axis in range(constants.COLS - 1))
+NOT_FIRST_Y_AXIS = sum(square_bit(x_axis, y_axis) for x_axis in range(constants.ROWS) for y_axis in range(1, constants.COLS))
+
+def neighbours(squares: int) -> int:
+    """
+    Get the squares next to a set of squares, diagonals included.
+    
+    parameters:
+    - squares (int): Bitmask of squares
+
+    Returns:
+    - int: Bitmask of the squares next to the given squares
+    """
+    up = squares & NOT_LAST_Y_AXIS
+    down = squares & NOT_FIRST_Y_AXIS
+    row = squares | up << 1 | down >> 1
+    return (row | row << constants.COLS | row >> constants.COLS) & BOARD_MASK & ~squares
+
+def flood_fill(start: int, empty: int) -> int:
+    """
+    Get all empty squares that can be reached from the start squares by walking over empty squares.
+    A queen can only ever reach the squares of its flood fill, because every queen move passes through neighbouring empty squares.
+    
+    parameters:
+    - start (int): Bitmask of the squares to start from
+    - empty (int): Bitmask of the empty squares
+
+    Returns:
+    - int: Bitmask of the reachable empty squares
+    """
+    region = 0
+    frontier = neighbours(start) & empty
+    while frontier:
+        region |= frontier
+        frontier = neighbours(frontier) & empty & ~region
+    return region
+
+ENDGAME_CACHE = {} #(origin, region) -> longest path, kept between games until it holds constants.ENDGAME_CACHE_SIZE entries
+
+def longest_path(origin: int, region: int) -> int:
+    """
+    Get the most moves a queen can make inside a region before it is stuck.
+    
+    parameters:
+    - origin (int): The square index of the queen
+    - region (int): Bitmask of the empty squares the queen can use
+
+    Returns:
+    - int: The length of the longest path
+    """
+    key = (origin, region)
+    if key in ENDGAME_CACHE:
+        return ENDGAME_CACHE[key]
+    
+    best = 0
+    size = region.bit_count()
+    for ray_mask, ray_moves in RAY_TABLES[origin]:
+        for dest_x_axis, dest_y_axis in ray_moves[region & ray_mask]:
+            dest = dest_x_axis * constants.COLS + dest_y_axis
+            best = max(best, 1 + longest_path(dest, region & ~(1 << dest)))
+        #no path can be longer than the number of squares in the region
+        if best == size:
+            break
+    #the cache starts over once it is full, so its memory stays bounded over long self-play runs
+    if len(ENDGAME_CACHE) >= constants.ENDGAME_CACHE_SIZE:
+        ENDGAME_CACHE.clear()
+    ENDGAME_CACHE[key] = best
+    return best
+
+def set_board_size(rows: int, cols: int) -> None:
+    """
+    Change the size of the board, the lookup tables and the sizes of the squares on the screen are rebuilt for the new size.
+    Games, transposition tables and move orderings made for another size can't be used afterwards,
+    worker pools have to be started after the size is set.
+    
+    parameters:
+    - rows (int): The number of x_axis coordinates
+    - cols (int): The number of y_axis coordinates
+
+    Returns:
+    - None
+    """
+    global BOARD_MASK, BETWEEN_MASKS, RAY_TABLES, ZOBRIST_KEYS, ZOBRIST_TURN_KEY, SQUARES, NOT_LAST_Y_AXIS, NOT_FIRST_Y_AXIS
+    constants.ROWS, constants.COLS = rows, cols
+    constants.SQUARE_SIZE, constants.QUEEN_SIZE = constants.square_sizes(rows, cols)
+    #python ints grow with the board, so boards beyond 64 squares still fit in a single bitboard
+    BOARD_MASK = (1 << (rows * cols)) - 1
+    BETWEEN_MASKS = initialize_between_masks()
+    RAY_TABLES = initialize_ray_tables()
+    ZOBRIST_KEYS, ZOBRIST_TURN_KEY = initialize_zobrist_keys()
+    SQUARES = [divmod(square, cols) for square in range(rows * cols)]
+    NOT_LAST_Y_AXIS = sum(square_bit(x_axis, y_axis) for x_axis in range(rows) for y_axis in range(cols - 1))
+    NOT_FIRST_Y_AXIS = sum(square_bit(x_axis, y_axis) for x_axis in range(rows) for y_axis in range(1, cols))
+    ENDGAME_CACHE.clear()
+
+def parse_board_size(size: str) -> tuple:
+    """
+    Read a board size given as ROWSxCOLS, for example 8x8.
+    
+    parameters:
+    - size (str): The board size
+
+    Returns:
+    - tuple: (rows, cols)
+    """
+    rows, cols = size.lower().split("x")
+    return int(rows), int(cols)
+
+class Game():
+    def __init__(self):
+        """
+        Initialize the game board and other game variables.
+        """
+        #the board is kept as bitmasks instead of a 2 dimensional array
+        self.empty = BOARD_MASK #bit set if the square is empty
+        self.destroyed = 0 #bit set if the square is destroyed
+        self.queens = [0, 0, 0] #bit of the queen of player 1 at index 1 and of player 2 at index 2
+        self.positions = [None, None, None] #(x_axis, y_axis) of player 1 at index 1 and of player 2 at index 2, kept up to date on every move and undo
+        self.turn = 1
+        self.winner = 0
+        self.moves = 0
+        self.hash = ZOBRIST_TURN_KEY #Zobrist hash of the position, updated by XOR on every move and undo. Player 1 starts
+        self.undo_stack = [] #(player, player_x_axis, player_y_axis, dest_x_axis, dest_y_axis) of every move made with make_move
+        self.nodes = 0 #number of moves made with make_move, which is the number of nodes a search visited
+        self.dirty = True #set when the board changes, the game loop clears it after drawing
+        
+    def is_move_valid(self, player_x_axis, player_y_axis, dest_x_axis, dest_y_axis) -> bool:
+        """
+        Check if a move is valid.
+
+        Parameters:
+        - player_x_axis (int): x_axis-coordinate of the current player's position
+        - player_y_axis (int): y_axis-coordinate of the current player's position
+        - dest_x_axis (int): x_axis-coordinate of the destination position
+        - dest_y_axis (int): y_axis-coordinate of the destination position
+
+        Returns:
+        - bool: True if the move is valid, False otherwise
+        """
+        dest = dest_x_axis * constants.COLS + dest_y_axis
+        
+        #check if destination is empty
+        if not self.empty >> dest & 1:
+            return False
+        
+        #check if destination is in same x_axis or y_axis as player and check if destination is on same diagonal as player
+        path = BETWEEN_MASKS[player_x_axis * constants.COLS + player_y_axis][dest]
+        if path is None:
+            return False
+        
+        #check if there is another player or destroyed tile between player and destination
+        return self.empty & path == path
+    
+    def move(self, player_x_axis, player_y_axis, dest_x_axis, dest_y_axis) -> bool:
+        """
+        Move the current player to the destination position.
+        Also switches the turn to the other player. and increments the moves.
+
+        Parameters:
+        - player_x_axis (int): x_axis-coordinate of the current player's position
+        - player_y_axis (int): y_axis-coordinate of the current player's position
+        - dest_x_axis (int): x_axis-coordinate of the destination position
+        - dest_y_axis (int): y_axis-coordinate of the destination position
+
+        Returns:
+        - bool: True if the move is successful, False otherwise
+        """
+        if self.is_move_valid(player_x_axis, player_y_axis, dest_x_axis, dest_y_axis):
+            self.move_bits(player_x_axis, player_y_axis, dest_x_axis, dest_y_axis, self.turn) #destination is now the player, old tile is now destroyed
+            self.moves += 1 #increment moves
+            self.turn = constants.PLAYER1 if self.turn == constants.PLAYER2 else constants.PLAYER2 #change turn
+            self.dirty = True
+            return True
+        else:
+            return False
+        
+    def move_bits(self, player_x_axis, player_y_axis, dest_x_axis, dest_y_axis, player: int) -> None:
+        """
+        Move a player on the bitboards without any checks.
+        The destination gets the queen and the old tile is destroyed.
+        The hash is updated for both squares and the side to move.
+
+        Parameters:
+        - player_x_axis (int): x_axis-coordinate of the player's position
+        - player_y_axis (int): y_axis-coordinate of the player's position
+        - dest_x_axis (int): x_axis-coordinate of the destination position
+        - dest_y_axis (int): y_axis-coordinate of the destination position
+        - player (int): The player to move
+
+        Returns:
+        - None
+        """
+        origin = player_x_axis * constants.COLS + player_y_axis
+        dest = dest_x_axis * constants.COLS + dest_y_axis
+        self.queens[player] = 1 << dest
+        self.positions[player] = (dest_x_axis, dest_y_axis)
+        self.empty &= ~(1 << dest)
+        self.destroyed |= 1 << origin
+        #queen leaves the origin, origin is destroyed, queen is on the destination and the other player is to move
+        self.hash ^= ZOBRIST_KEYS[origin * 3 + player - 1] ^ ZOBRIST_KEYS[origin * 3 + constants.DESTROYED - 1] ^ ZOBRIST_KEYS[dest * 3 + player - 1] ^ ZOBRIST_TURN_KEY
+        
+    def make_move(self, dest_x_axis, dest_y_axis, player: int) -> None:
+        """
+        Make a move for a player without checking if it is valid, used for moves that come from available_moves.
+        The move is pushed on the undo stack so unmake_move can take it back.
+        Unlike move this does not switch the turn or increment the moves.
+
+        Parameters:
+        - dest_x_axis (int): x_axis-coordinate of the destination position
+        - dest_y_axis (int): y_axis-coordinate of the destination position
+        - player (int): The player to move
+
+        Returns:
+        - None
+        """
+        player_x_axis, player_y_axis = self.positions[player]
+        self.undo_stack.append((player, player_x_axis, player_y_axis, dest_x_axis, dest_y_axis))
+        self.nodes += 1
+        self.move_bits(player_x_axis, player_y_axis, dest_x_axis, dest_y_axis, player)
+        
+    def unmake_move(self) -> None:
+        """
+        Take back the last move made with make_move.
+        The board, the hash and the queen position are restored together.
+
+        Returns:
+        - None
+        """
+        player, player_x_axis, player_y_axis, dest_x_axis, dest_y_axis = self.undo_stack.pop()
+        origin = player_x_axis * constants.COLS + player_y_axis
+        dest = dest_x_axis * constants.COLS + dest_y_axis
+        self.queens[player] = 1 << origin
+        self.positions[player] = (player_x_axis, player_y_axis)
+        self.empty |= 1 << dest
+        self.destroyed &= ~(1 << origin)
+        #XOR is its own inverse, so the same keys as in move_bits restore the hash
+        self.hash ^= ZOBRIST_KEYS[origin * 3 + player - 1] ^ ZOBRIST_KEYS[origin * 3 + constants.DESTROYED - 1] ^ ZOBRIST_KEYS[dest * 3 + player - 1] ^ ZOBRIST_TURN_KEY
+        
+    def __getstate__(self) -> dict:
+        """
+        Get the state that is pickled when the game is sent to a worker process.
+        The methods SearchStats wraps on the instance are left out, they can't be pickled and the worker uses the methods of the class.
+
+        Returns:
+        - dict: The attributes of the game without the wrapped methods
+        """
+        return {name: value for name, value in self.__dict__.items() if not callable(value)}
+        
+    def copy(self) -> "Game":
+        """
+        Copy the game state, so it can be searched without changing the game that is drawn.
+        The undo stack is not copied.
+
+        Returns:
+        - Game: The copy
+        """
+        game = Game()
+        game.empty = self.empty
+        game.destroyed = self.destroyed
+        game.queens = self.queens.copy()
+        game.positions = self.positions.copy()
+        game.turn = self.turn
+        game.winner = self.winner
+        game.moves = self.moves
+        game.hash = self.hash
+        return game
+        
+    def place_player(self, player: int, x_axis: int, y_axis: int) -> None:
+        """
+        Place a player on an empty square, used to set up the start position.
+
+        Parameters:
+        - player (int): The player to place
+        - x_axis (int): x_axis-coordinate of the square
+        - y_axis (int): y_axis-coordinate of the square
+
+        Returns:
+        - None
+        """
+        bit = square_bit(x_axis, y_axis)
+        self.queens[player] = bit
+        self.positions[player] = (x_axis, y_axis)
+        self.empty &= ~bit
+        self.hash ^= ZOBRIST_KEYS[(x_axis * constants.COLS + y_axis) * 3 + player - 1]
+        self.dirty = True
+        
+    def get_square(self, x_axis: int, y_axis: int) -> int:
+        """
+        Get what is on a square.
+
+        Parameters:
+        - x_axis (int): x_axis-coordinate of the square
+        - y_axis (int): y_axis-coordinate of the square
+
+        Returns:
+        - int: constants.EMPTY, constants.PLAYER1, constants.PLAYER2 or constants.DESTROYED
+        """
+        bit = square_bit(x_axis, y_axis)
+        if self.empty & bit:
+            return constants.EMPTY
+        if self.destroyed & bit:
+            return constants.DESTROYED
+        return constants.PLAYER1 if self.queens[constants.PLAYER1] & bit else constants.PLAYER2
+        
+    def getplayer(self, player=None) -> tuple:
+        """
+        Get the current player's position.
+        If player is specified, return the position of the specified player instead.
+
+
+        Parameters:
+        - player (int): The player to get the position for
+
+        Returns:
+        - tuple: (x_axis, y_axis) coordinates of the current player's position
+        """        
+        return self.positions[player] if player else self.positions[self.turn]
+                
+    def partition_regions(self) -> tuple:
+        """
+        Check if the queens are cut off from each other by destroyed squares.
+        
+        Returns:
+        - tuple: (region of player 1, region of player 2) as bitmasks of empty squares if the queens are cut off, None otherwise
+        """
+        #flood fill from player 1 and stop as soon as it gets next to player 2
+        touching = neighbours(self.queens[constants.PLAYER2])
+        if self.queens[constants.PLAYER1] & touching:
+            return None
+        region = 0
+        frontier = neighbours(self.queens[constants.PLAYER1]) & self.empty
+        while frontier:
+            if frontier & touching:
+                return None
+            region |= frontier
+            frontier = neighbours(frontier) & self.empty & ~region
+        return region, flood_fill(self.queens[constants.PLAYER2], self.empty)
+        
+    def is_game_over(self, active_player: int=None) -> bool:
+        """
+        Check if the game is over.
+        
+        parameters:
+        - active_player (int): The player to check if the game is over for
+
+        Returns:
+        - bool: True if the game is over, False otherwise
+        """
+        #check if there are no more moves left for the current player
+        #if active_player is specified, check if there are no more moves left for the specified player
+        if active_player:
+            if len(self.available_moves(active_player)) == constants.EMPTY:
+                self.winner = constants.PLAYER1 if active_player == constants.PLAYER2 else constants.PLAYER2
+                return True
+            else:
+                return False
+        
+        if len(self.available_moves()) == constants.EMPTY:
+            self.winner = constants.PLAYER1 if self.turn == constants.PLAYER2 else constants.PLAYER2
+            return True
+        
+        return False
+
+    def available_moves(self, player=None) -> list:
+        """
+        Get a list of available moves for the current player.
+        If player is specified, return a list of available moves for the specified player instead.
+        
+        parameters:
+        - player (int): The player to get the available moves for
+
+        Returns:
+        - list: List of available moves as tuples (x_axis, y_axis)
+        """
+        player_x_axis, player_y_axis = self.positions[player] if player else self.positions[self.turn]
+        #one table lookup per direction instead of checking every square of the board
+        empty = self.empty
+        moves = []
+        for ray_mask, ray_moves in RAY_TABLES[player_x_axis * constants.COLS + player_y_axis]:
+            moves.extend(ray_moves[empty & ray_mask])
+        return moves
+    
+    def evaluate(self, player: int) -> tuple:
+        """
+        Generate the moves of both players in a single pass and evaluate the game state for a player.
+        This replaces calling is_game_over for both players and available_moves again for the mobility.
+        Unlike is_game_over it does not set the winner.
+        
+        parameters:
+        - player (int): The player to evaluate the game state for
+
+        Returns:
+        - tuple: (winner, score, moves, other_moves) where winner is constants.EMPTY if the game is not over,
+                 score is constants.WINNING_SCORE or -constants.WINNING_SCORE if it is over and the mobility difference otherwise,
+                 moves and other_moves are the available moves of the player and the other player
+        """
+        other_player = constants.PLAYER1 if player == constants.PLAYER2 else constants.PLAYER2
+        empty = self.empty
+        player_x_axis, player_y_axis = self.positions[player]
+        moves = []
+        for ray_mask, ray_moves in RAY_TABLES[player_x_axis * constants.COLS + player_y_axis]:
+            moves.extend(ray_moves[empty & ray_mask])
+        player_x_axis, player_y_axis = self.positions[other_player]
+        other_moves = []
+        for ray_mask, ray_moves in RAY_TABLES[player_x_axis * constants.COLS + player_y_axis]:
+            other_moves.extend(ray_moves[empty & ray_mask])
+        
+        #a player without moves has lost, the player is checked first
+        if not moves:
+            return other_player, -constants.WINNING_SCORE, moves, other_moves
+        if not other_moves:
+            return player, constants.WINNING_SCORE, moves, other_moves
+        # old algorithm can be found at: https://www.desmos.com/calculator/bijlk0fzbv
+        return constants.EMPTY, len(moves) - len(other_moves), moves, other_moves
+
+
+def start_game() -> Game:
+    """
+    Get the position every game starts from, player 1 in the first corner and player 2 in the opposite corner of the board.
+    
+    Returns:
+    - Game: The start position
+    """
+    game = Game()
+    game.place_player(constants.PLAYER1, 0, 0)
+    game.place_player(constants.PLAYER2, constants.ROWS - 1, constants.COLS - 1)
+    return game
+
+SEARCH_IDS = itertools.count() #numbers the transposition tables and their searches, so a worker can tell them apart
+
+class TranspositionTable():
+    def __init__(self, size: int=constants.TT_SIZE, bucket_size: int=constants.TT_BUCKET_SIZE, replacement: str=constants.TT_REPLACEMENT):
+        """
+        Initialize a transposition table with a fixed memory budget.
+        The entries are packed in preallocated arrays and grouped in buckets, the bucket of a position is picked by the lower bits of its hash.
+        
+        parameters:
+        - size (int): The number of entries, rounded down to a power of two number of buckets
+        - bucket_size (int): The number of entries in a bucket
+        - replacement (str): constants.DEPTH_PREFERRED or constants.ALWAYS_REPLACE
+        """
+        buckets = 1 << max(size // bucket_size, 1).bit_length() - 1
+        self.bucket_size = bucket_size
+        self.mask = buckets - 1
+        self.replacement = replacement
+        self.age = 0 #incremented on every new search, entries from older searches are replaced first
+        self.id = next(SEARCH_IDS) #the workers keep a transposition table per id, so engines sharing a pool don't share entries
+        self.search_id = self.id #changes on every new search, the workers start a new search when it changes
+        size = buckets * bucket_size
+        self.keys = array("Q", bytes(8 * size))
+        self.depths = array("b", [-1]) * size #-1 marks an empty entry
+        self.scores = array("h", bytes(2 * size))
+        self.bounds = array("b", bytes(size))
+        self.moves = array("h", [-1]) * size #square index of the best move, -1 if there is none
+        self.ages = array("B", bytes(size))
+        self.file = None #TranspositionTableFile that is looked up at the root when the table has no entry
+        
+    def new_search(self) -> None:
+        """
+        Start a new search, the entries of earlier searches age and are replaced before the entries of this search.
+        
+        Returns:
+        - None
+        """
+        self.age = (self.age + 1) & 0xFF
+        self.search_id = next(SEARCH_IDS)
+        
+    def get(self, key: int) -> tuple:
+        """
+        Get the entry for a Zobrist hash.
+        
+        parameters:
+        - key (int): The Zobrist hash of the game state
+
+        Returns:
+        - tuple: (depth, score, bound, best_move), None if the game state is not in the table
+        """
+        start = (key & self.mask) * self.bucket_size
+        try:
+            slot = self.keys.index(key, start, start + self.bucket_size) #searches the bucket in C instead of a python loop
+        except ValueError:
+            return None
+        if self.depths[slot] < 0:
+            return None
+        move = self.moves[slot]
+        return self.depths[slot], self.scores[slot], self.bounds[slot], SQUARES[move] if move >= 0 else None
+    
+    def store(self, key: int, depth: int, score: int, bound: int, best_move: tuple) -> None:
+        """
+        Store an entry for a Zobrist hash.
+        An entry for the same game state is always overwritten, otherwise the replacement policy picks the entry to replace.
+        
+        parameters:
+        - key (int): The Zobrist hash of the game state
+        - depth (int): The depth the game state was searched to
+        - score (int): The score for the player to move
+        - bound (int): constants.EXACT, constants.LOWER_BOUND or constants.UPPER_BOUND
+        - best_move (tuple): The best move as (x_axis, y_axis), None if there is none
+
+        Returns:
+        - None
+        """
+        start = (key & self.mask) * self.bucket_size
+        end = start + self.bucket_size
+        try:
+            victim = self.keys.index(key, start, end)
+        except ValueError:
+            victim = -1
+        
+        if victim < 0:
+            #with depth-preferred the last entry of the bucket is the always-replace entry and is not compared on depth
+            last = end - 1 if self.replacement == constants.DEPTH_PREFERRED and self.bucket_size > 1 else end
+            lowest = None
+            for slot in range(start, last):
+                #entries from an older search are worth less than any entry of this search
+                value = self.depths[slot] if self.ages[slot] == self.age else -1
+                if lowest is None or value < lowest:
+                    victim, lowest = slot, value
+            if last != end and (lowest is None or lowest > depth):
+                victim = last
+        
+        self.keys[victim] = key
+        self.depths[victim] = depth
+        self.scores[victim] = score
+        self.bounds[victim] = bound
+        self.moves[victim] = best_move[0] * constants.COLS + best_move[1] if best_move else -1
+        self.ages[victim] = self.age
+        
+    def items(self):
+        """
+        Iterate over the filled entries.
+        
+        Returns:
+        - generator: (key, (depth, score, bound, best_move)) for every filled entry
+        """
+        for slot in range(len(self.keys)):
+            if self.depths[slot] >= 0:
+                move = self.moves[slot]
+                yield self.keys[slot], (self.depths[slot], self.scores[slot], self.bounds[slot], SQUARES[move] if move >= 0 else None)
+
+#file layout: a header followed by fixed-size records sorted by key, all little-endian
+TT_FILE_MAGIC = b"ISTT"
+TT_FILE_VERSION = 2
+TT_FILE_HEADER = struct.Struct("<4sHBBIQ") #magic, version, rows, cols, zobrist seed, number of records
+TT_FILE_RECORD = struct.Struct("<Qbhbh") #key, depth, score, bound, square index of the best move (-1 if there is none)
+
+class TranspositionTableFile():
+    def __init__(self, path: str):
+        """
+        Open a transposition table file read-only through mmap.
+        Nothing is parsed on opening, lookups binary search the sorted records in the mapped pages,
+        so several engine processes can share the same pages.
+        A missing file or a file for another board or seed is opened as an empty table.
+        
+        parameters:
+        - path (str): The path of the file
+        """
+        self.path = path
+        self.map = None
+        self.count = 0
+        self.mismatch = False #True if the file exists but was written for another board, seed or version, it must not be overwritten
+        try:
+            with open(path, "rb") as file:
+                if os.fstat(file.fileno()).st_size < TT_FILE_HEADER.size:
+                    return
+                self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return
+        
+        magic, version, rows, cols, seed, count = TT_FILE_HEADER.unpack_from(self.map)
+        if (magic, version, rows, cols, seed) != (TT_FILE_MAGIC, TT_FILE_VERSION, constants.ROWS, constants.COLS, constants.SEED) or len(self.map) < TT_FILE_HEADER.size + count * TT_FILE_RECORD.size:
+            print(f"{path} does not match this engine and is ignored")
+            self.mismatch = True
+            self.close()
+            return
+        self.count = count
+        
+    def get(self, key: int) -> tuple:
+        """
+        Get the entry for a Zobrist hash.
+        
+        parameters:
+        - key (int): The Zobrist hash of the game state
+
+        Returns:
+        - tuple: (depth, score, bound, best_move), None if the game state is not in the file
+        """
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if struct.unpack_from("<Q", self.map, TT_FILE_HEADER.size + middle * TT_FILE_RECORD.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self.count:
+            return None
+        record_key, depth, score, bound, move = TT_FILE_RECORD.unpack_from(self.map, TT_FILE_HEADER.size + low * TT_FILE_RECORD.size)
+        if record_key != key:
+            return None
+        return depth, score, bound, SQUARES[move] if move >= 0 else None
+    
+    def items(self):
+        """
+        Iterate over the records.
+        
+        Returns:
+        - generator: (key, (depth, score, bound, best_move)) for every record, sorted by key
+        """
+        for index in range(self.count):
+            key, depth, score, bound, move = TT_FILE_RECORD.unpack_from(self.map, TT_FILE_HEADER.size + index * TT_FILE_RECORD.size)
+            yield key, (depth, score, bound, SQUARES[move] if move >= 0 else None)
+            
+    def close(self) -> None:
+        """
+        Unmap the file.
+        
+        Returns:
+        - None
+        """
+        if self.map is not None:
+            self.map.close()
+        self.map = None
+        self.count = 0
+
+def write_transition_table_file(path: str, entries: dict) -> None:
+    """
+    Write entries to a transposition table file.
+    The file is written next to the old one and then swapped in, so processes that have the old file mapped keep a valid table.
+    
+    parameters:
+    - path (str): The path of the file
+    - entries (dict): Maps a Zobrist hash to (depth, score, bound, best_move)
+
+    Returns:
+    - None
+    """
+    keys = sorted(entries)
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(TT_FILE_HEADER.pack(TT_FILE_MAGIC, TT_FILE_VERSION, constants.ROWS, constants.COLS, constants.SEED, len(keys)))
+        for key in keys:
+            depth, score, bound, best_move = entries[key]
+            file.write(TT_FILE_RECORD.pack(key, depth, score, bound, best_move[0] * constants.COLS + best_move[1] if best_move else -1))
+    os.replace(temporary_path, path)
+
+class MoveOrdering():
+    def __init__(self):
+        """
+        Initialize the move ordering of a search.
+        Moves are tried in this order: the transposition table move, the killer moves of the ply, then the moves with the highest history score.
+        """
+        squares = constants.ROWS * constants.COLS
+        self.killers = [] #killers[depth] is a list of the last 2 moves that caused a cutoff at that depth
+        self.history = [0] * (squares * squares) #history[origin * squares + dest] grows every time the move causes a cutoff
+        self.cutoffs = 0 #number of nodes that were cut off
+        self.first_move_cutoffs = 0 #number of nodes that were cut off by the first move that was tried
+        
+    def new_search(self) -> None:
+        """
+        Start a new search, the killer moves are cleared and the history scores are halved so older results weigh less.
+        
+        Returns:
+        - None
+        """
+        self.killers = []
+        self.history = [score // 2 for score in self.history]
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        
+    def order(self, moves: list, tt_move: tuple, depth: int, origin: int) -> list:
+        """
+        Order moves so the moves most likely to cause a cutoff are tried first.
+        
+        parameters:
+        - moves (list): The moves as (x_axis, y_axis)
+        - tt_move (tuple): The best move from the transposition table, None if there is none
+        - depth (int): The depth of the node in the search
+        - origin (int): The square index of the player that moves
+
+        Returns:
+        - list: The ordered moves
+        """
+        history = self.history
+        base = origin * constants.ROWS * constants.COLS
+        ordered = sorted(moves, key=lambda move: history[base + move[0] * constants.COLS + move[1]], reverse=True)
+        
+        front = []
+        if tt_move in moves:
+            front.append(tt_move)
+        if depth < len(self.killers):
+            for killer in self.killers[depth]:
+                if killer not in front and killer in moves:
+                    front.append(killer)
+        if front:
+            ordered = front + [move for move in ordered if move not in front]
+        return ordered
+    
+    def cutoff(self, move: tuple, move_index: int, depth: int, remaining_depth: int, origin: int) -> None:
+        """
+        Record a move that caused a cutoff as killer move and in the history.
+        
+        parameters:
+        - move (tuple): The move as (x_axis, y_axis)
+        - move_index (int): The index of the move in the ordered moves
+        - depth (int): The depth of the node in the search
+        - remaining_depth (int): The depth left below the node, deeper cutoffs weigh more in the history
+        - origin (int): The square index of the player that moves
+
+        Returns:
+        - None
+        """
+        self.cutoffs += 1
+        if move_index == 0:
+            self.first_move_cutoffs += 1
+        
+        while len(self.killers) <= depth:
+            self.killers.append([])
+        killers = self.killers[depth]
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[2:]
+        self.history[origin * constants.ROWS * constants.COLS + move[0] * constants.COLS + move[1]] += remaining_depth * remaining_depth
+        
+    def first_move_cutoff_rate(self) -> float:
+        """
+        Get how often the first move that was tried caused the cutoff, the higher the better the ordering.
+        
+        Returns:
+        - float: The fraction of cutoffs caused by the first move, 0 if there were no cutoffs
+        """
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+class SearchStats():
+    def __init__(self):
+        """
+        Collect statistics of a search: nodes per ply, cutoffs by move index, transposition table use and where the time goes.
+        Nothing in the search checks for statistics, instrument wraps the game, the table and the ordering for one search
+        and release takes the wrappers away again, so a search without statistics runs the same code as before.
+        """
+        self.nodes = [] #nodes[ply] is the number of moves made at that ply below the root
+        self.worker_nodes = 0 #moves made by the worker processes of a parallel search, only their number is known
+        self.cutoffs = {} #move index -> number of cutoffs caused by the move at that index
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.evaluate_seconds = 0.0 #move generation and evaluation, they are done in the same pass by Game.evaluate
+        self.move_seconds = 0.0 #make_move and unmake_move
+        self.ordering_seconds = 0.0
+        self.table_seconds = 0.0
+        self.start = None
+        self.seconds = 0.0
+        
+    def instrument(self, game: Game, transition_table: TranspositionTable, ordering: MoveOrdering) -> tuple:
+        """
+        Start collecting for a search on a game state.
+        The methods of the game are wrapped on the instance, the table and the ordering are wrapped in counting objects.
+        
+        parameters:
+        - game (Game): The game state that is searched
+        - transition_table (TranspositionTable): The transition table of the search
+        - ordering (MoveOrdering): The move ordering of the search
+
+        Returns:
+        - tuple: (transition_table, ordering) to search with instead
+        """
+        root = len(game.undo_stack)
+        nodes = self.nodes
+        make_move, unmake_move, evaluate = game.make_move, game.unmake_move, game.evaluate
+        
+        def counted_make_move(dest_x_axis: int, dest_y_axis: int, player: int) -> None:
+            start = time.perf_counter()
+            make_move(dest_x_axis, dest_y_axis, player)
+            self.move_seconds += time.perf_counter() - start
+            ply = len(game.undo_stack) - root - 1
+            while len(nodes) <= ply:
+                nodes.append(0)
+            nodes[ply] += 1
+            
+        def timed_unmake_move() -> None:
+            start = time.perf_counter()
+            unmake_move()
+            self.move_seconds += time.perf_counter() - start
+            
+        def timed_evaluate(player: int) -> tuple:
+            start = time.perf_counter()
+            result = evaluate(player)
+            self.evaluate_seconds += time.perf_counter() - start
+            return result
+        
+        game.make_move, game.unmake_move, game.evaluate = counted_make_move, timed_unmake_move, timed_evaluate
+        self.start = time.perf_counter()
+        return CountingTranspositionTable(transition_table, self), CountingMoveOrdering(ordering, self)
+    
+    def release(self, game: Game) -> None:
+        """
+        Stop collecting, the game gets its own methods back.
+        
+        parameters:
+        - game (Game): The game state that was searched
+
+        Returns:
+        - None
+        """
+        for name in ("make_move", "unmake_move", "evaluate"):
+            game.__dict__.pop(name, None)
+        if self.start is not None:
+            self.seconds += time.perf_counter() - self.start
+            self.start = None
+            
+    def effective_branching_factor(self, depth: int) -> float:
+        """
+        Get the effective branching factor, the branching factor a uniform tree of the searched depth with the same number of nodes has.
+        
+        parameters:
+        - depth (int): The depth that was reached
+
+        Returns:
+        - float: The effective branching factor, 0 if nothing was searched
+        """
+        total = sum(self.nodes)
+        return total ** (1 / depth) if total and depth else 0.0
+    
+    def report(self, depth: int) -> None:
+        """
+        Print the statistics.
+        
+        parameters:
+        - depth (int): The depth that was reached
+
+        Returns:
+        - None
+        """
+        total = sum(self.nodes)
+        cutoffs = sum(self.cutoffs.values())
+        print(f"Search statistics: {total} nodes in {self.seconds:.3f}s, effective branching factor {self.effective_branching_factor(depth):.2f}")
+        print(f"  nodes per ply: {', '.join(str(count) for count in self.nodes)}")
+        print(f"  cutoffs: {cutoffs}, by move index: {', '.join(f'{index}: {count / cutoffs:.0%}' for index, count in sorted(self.cutoffs.items()))}")
+        print(f"  transposition table: {self.probes} probes, {self.hits} hits ({self.hits / self.probes if self.probes else 0:.0%}), {self.stores} stores")
+        other = self.seconds - self.evaluate_seconds - self.move_seconds - self.ordering_seconds - self.table_seconds
+        print(f"  time: move generation and evaluation {self.evaluate_seconds:.3f}s, make and unmake {self.move_seconds:.3f}s, "
+              f"ordering {self.ordering_seconds:.3f}s, transposition table {self.table_seconds:.3f}s, other {other:.3f}s")
+        if self.worker_nodes:
+            print(f"  worker processes: {self.worker_nodes} nodes, the statistics above only cover the root")
+
+class CountingTranspositionTable():
+    def __init__(self, transition_table: TranspositionTable, stats: SearchStats):
+        """
+        Wrap a transposition table to count its probes, hits and stores, everything else is passed on to the table.
+        
+        parameters:
+        - transition_table (TranspositionTable): The wrapped table
+        - stats (SearchStats): The statistics to count in
+        """
+        self.transition_table = transition_table
+        self.stats = stats
+        
+    def __getattr__(self, name: str):
+        return getattr(self.transition_table, name)
+    
+    def get(self, key: int) -> tuple:
+        """
+        Get the entry for a Zobrist hash from the wrapped table and count the probe.
+        """
+        start = time.perf_counter()
+        entry = self.transition_table.get(key)
+        self.stats.table_seconds += time.perf_counter() - start
+        self.stats.probes += 1
+        if entry is not None:
+            self.stats.hits += 1
+        return entry
+    
+    def store(self, key: int, depth: int, score: int, bound: int, best_move: tuple) -> None:
+        """
+        Store an entry in the wrapped table and count the store.
+        """
+        start = time.perf_counter()
+        self.transition_table.store(key, depth, score, bound, best_move)
+        self.stats.table_seconds += time.perf_counter() - start
+        self.stats.stores += 1
+
+class CountingMoveOrdering():
+    def __init__(self, ordering: MoveOrdering, stats: SearchStats):
+        """
+        Wrap a move ordering to time the ordering and count the cutoffs by move index, everything else is passed on to the ordering.
+        
+        parameters:
+        - ordering (MoveOrdering): The wrapped ordering
+        - stats (SearchStats): The statistics to count in
+        """
+        self.ordering = ordering
+        self.stats = stats
+        
+    def __getattr__(self, name: str):
+        return getattr(self.ordering, name)
+    
+    def order(self, moves: list, tt_move: tuple, depth: int, origin: int) -> list:
+        """
+        Order the moves with the wrapped ordering and time it.
+        """
+        start = time.perf_counter()
+        ordered = self.ordering.order(moves, tt_move, depth, origin)
+        self.stats.ordering_seconds += time.perf_counter() - start
+        return ordered
+    
+    def cutoff(self, move: tuple, move_index: int, depth: int, remaining_depth: int, origin: int) -> None:
+        """
+        Count the cutoff by the index of the move and record it in the wrapped ordering.
+        """
+        self.stats.cutoffs[move_index] = self.stats.cutoffs.get(move_index, 0) + 1
+        self.ordering.cutoff(move, move_index, depth, remaining_depth, origin)
+
+def solve_endgame(game: Game, player: int) -> tuple:
+    """
+    Solve the game exactly once the queens are cut off from each other.
+    From then on each player can only walk its own region, the player with the longest path wins.
+    
+    parameters:
+    - game (Game): The game state
+    - player (int): The player to move
+
+    Returns:
+    - tuple: (winner, best_move) where best_move starts the longest path of the player to move, None if the queens are not cut off
+             or a region is larger than constants.ENDGAME_MAX_REGION
+    """
+    regions = game.partition_regions()
+    if regions is None or max(regions[0].bit_count(), regions[1].bit_count()) > constants.ENDGAME_MAX_REGION:
+        return None
+    other_player = constants.PLAYER1 if player == constants.PLAYER2 else constants.PLAYER2
+    region, other_region = regions[player - 1], regions[other_player - 1]
+    other_x_axis, other_y_axis = game.positions[other_player]
+    other_length = longest_path(other_x_axis * constants.COLS + other_y_axis, other_region)
+    
+    player_x_axis, player_y_axis = game.positions[player]
+    length, best_move = 0, None
+    for ray_mask, ray_moves in RAY_TABLES[player_x_axis * constants.COLS + player_y_axis]:
+        for dest_x_axis, dest_y_axis in ray_moves[region & ray_mask]:
+            dest = dest_x_axis * constants.COLS + dest_y_axis
+            path = 1 + longest_path(dest, region & ~(1 << dest))
+            if path > length:
+                length, best_move = path, (dest_x_axis, dest_y_axis)
+    
+    #the players take turns, so the player to move is stuck first when the paths are equally long
+    return (player if length > other_length else other_player), best_move
+
+class SearchTimeout(Exception):
+    """
+    Raised inside MiniMax when the deadline of the search has passed.
+    """
+
+def MiniMax(game: Game, depth: int, alfa: int, beta: int, is_maximizing: bool, transition_table: TranspositionTable=None, max_depth: int=constants.MAX_DEPTH, deadline: float=None, ordering: MoveOrdering=None, pvs: bool=False) -> int:
+    """
+    The MiniMax algorithm.
+    If a transition table is given it is probed and updated on every node.
+    parameters:
+    - game (Game): The game state to evaluate
+    - depth (int): The current depth of the search
+    - alfa (int): The current best score for the maximizing player
+    - beta (int): The current best score for the minimizing player
+    - is_maximizing (bool): True if the current player is the maximizing player, False otherwise
+    - transition_table (TranspositionTable): The transition table
+    - max_depth (int): The depth at which the game state is evaluated
+    - deadline (float): time.perf_counter() time at which SearchTimeout is raised, the moves made on the way are not unmade
+    - ordering (MoveOrdering): The move ordering, without it the moves are searched in the order available_moves returns them
+    - pvs (bool): True to use principal variation search, only the first move gets the full window
+    
+    Returns:
+    - int: The best score for the current game state
+    """
+    
+    #set ai_player to constants.PLAYER2 if game.turn is constants.PLAYER2, else set to constants.PLAYER1
+    ai_player = constants.PLAYER2 if game.turn == constants.PLAYER2 else constants.PLAYER1
+    other_player = constants.PLAYER1 if game.turn == constants.PLAYER2 else constants.PLAYER2
+    
+    #scores and bounds in the transition table are for the player to move, so they are flipped for the minimizing player
+    remaining_depth = max_depth - depth
+    sign = 1 if is_maximizing else -1
+    tt_move = None
+    if transition_table is not None:
+        entry = transition_table.get(game.hash)
+        if entry:
+            tt_move = entry[3]
+        if entry and entry[0] >= remaining_depth:
+            score, bound = entry[1] * sign, entry[2] * sign
+            if bound == constants.EXACT:
+                return score
+            elif bound == constants.LOWER_BOUND:
+                alfa = max(alfa, score)
+            else:
+                beta = min(beta, score)
+            if alfa >= beta:
+                return score
+    
+    #one pass gives the game over check, the mobility score and the moves of the node
+    winner, score, ai_moves, other_moves = game.evaluate(ai_player)
+    if winner:
+        return score
+        
+    #once the queens are cut off the result is known exactly
+    endgame = solve_endgame(game, ai_player if is_maximizing else other_player)
+    if endgame:
+        return constants.WINNING_SCORE if endgame[0] == ai_player else -constants.WINNING_SCORE
+        
+    #if depth is max_depth, the score is the difference in the possible amount of moves
+    if depth  == max_depth:
+        return score
+    
+    if deadline is not None and time.perf_counter() > deadline:
+        raise SearchTimeout
+        
+    current_player = other_player
+    best_score = constants.DEFAULT_BEST_SCORE
+    if is_maximizing:
+        current_player = ai_player
+        best_score = -constants.DEFAULT_BEST_SCORE
+
+    alfa_window, beta_window = alfa, beta #the window the node is searched with, to know what kind of bound the result is
+    best_move = None
+    moves = ai_moves if is_maximizing else other_moves
+    if ordering is not None:
+        player_x_axis, player_y_axis = game.positions[current_player]
+        origin = player_x_axis * constants.COLS + player_y_axis
+        moves = ordering.order(moves, tt_move, depth, origin)
+    for move_index, move in enumerate(moves):
+        dest_x_axis, dest_y_axis = move
+        game.make_move(dest_x_axis, dest_y_axis, current_player)
+        if pvs and move_index:
+            #the first move is expected to be the best, the others are searched with a null window to prove they are not better
+            if is_maximizing:
+                score = MiniMax(game, depth + 1, alfa, alfa + 1, False, transition_table, max_depth, deadline, ordering, pvs)
+            else:
+                score = MiniMax(game, depth + 1, beta - 1, beta, True, transition_table, max_depth, deadline, ordering, pvs)
+            #the move is better after all, search it again with the full window to get its score
+            if alfa < score < beta:
+                score = MiniMax(game, depth + 1, alfa, beta, not is_maximizing, transition_table, max_depth, deadline, ordering, pvs)
+        else:
+            score = MiniMax(game, depth + 1, alfa, beta, not is_maximizing, transition_table, max_depth, deadline, ordering, pvs)
+        game.unmake_move()
+        if (is_maximizing and score > best_score) or (not is_maximizing and score < best_score):
+            best_score = score
+            best_move = move
+
+        if (is_maximizing and best_score >= beta) or (not is_maximizing and best_score <= alfa):
+            if ordering is not None:
+                ordering.cutoff(move, move_index, depth, remaining_depth, origin)
+            break
+        if is_maximizing:
+            alfa = max(best_score, alfa)
+        else:
+            beta = min(best_score, beta)
+    
+    if transition_table is not None:
+        bound = constants.EXACT
+        if best_score <= alfa_window:
+            bound = constants.UPPER_BOUND
+        elif best_score >= beta_window:
+            bound = constants.LOWER_BOUND
+        transition_table.store(game.hash, remaining_depth, best_score * sign, bound * sign, best_move)
+        
+    return best_score
+
+def zobrist_hash(game: Game) -> int:
+    """
+    Get the Zobrist hash for the current game state.
+    The game keeps the hash up to date on every move, so this does not rebuild it from the board.
+    
+    parameters:
+    - game (Game): The game state
+
+    Returns:
+    - int: The Zobrist hash for the current game state
+    """
+    # print("Zobrist hash:", game.hash)
+    # print("current board state:", game.empty, game.destroyed, game.queens)
+    # print("current player:", game.turn)
+        
+    return game.hash
+
+def get_entry_from_transition_table(game: Game, transition_table: TranspositionTable) -> tuple:
+    """
+    Get the entry for the current game state from the transition table.
+    
+    parameters:
+    - game (Game): The game state
+    - transition_table (TranspositionTable): The transition table
+
+    Returns:
+    - tuple: (depth, score, bound, best_move) for the current game state, None if the game state is not in the transition table.
+             The score and bound are for the player to move
+    """
+    #print("Retrieved", zobrist_hash(game), ":", transition_table.get(zobrist_hash(game)))
+    entry = transition_table.get(zobrist_hash(game))
+    if entry is None and transition_table.file is not None:
+        entry = transition_table.file.get(zobrist_hash(game))
+    return entry
+
+#make a function to store a search result in the transition table
+def store_entry_in_transition_table(game: Game, depth: int, score: int, bound: int, best_move: tuple, transition_table: TranspositionTable) -> TranspositionTable:
+    """
+    Store a search result for the current game state in the transition table.
+    
+    parameters:
+    - game (Game): The game state
+    - depth (int): The depth the game state was searched to
+    - score (int): The score for the player to move
+    - bound (int): constants.EXACT, constants.LOWER_BOUND or constants.UPPER_BOUND
+    - best_move (tuple): The best move for the current game state
+    - transition_table (TranspositionTable): The transition table
+
+    Returns:
+    - TranspositionTable: The updated transition table
+    """
+    transition_table.store(zobrist_hash(game), depth, score, bound, best_move)
+    # print("Transition table updated")
+    # print("Added", zobrist_hash(game), ":", transition_table.get(zobrist_hash(game)))    
+    return transition_table
+
+def board_size_path(path: str) -> str:
+    """
+    Add the board size to a file name, so the files of different board sizes don't overwrite each other.
+    
+    parameters:
+    - path (str): The path of the file, for example constants.TT_FILE
+
+    Returns:
+    - str: The path with the board size, for example transition_table_6x6.bin
+    """
+    root, extension = os.path.splitext(path)
+    return f"{root}_{constants.ROWS}x{constants.COLS}{extension}"
+
+def get_transition_table_from_file() -> TranspositionTable:
+    """
+    Get the transition table from a file.
+    The file is memory-mapped and not loaded, the returned table looks it up when it has no entry itself.
+
+    Returns:
+    - TranspositionTable: The transition table
+    """
+    transition_table = TranspositionTable()
+    transition_table.file = TranspositionTableFile(board_size_path(constants.TT_FILE))
+    if transition_table.file.count:
+        print("Transition table retrieved from file")
+    elif not transition_table.file.mismatch:
+        print("Transition table file not found")
+    return transition_table
+    
+def store_transition_table_in_file(transition_table: TranspositionTable) -> None:
+    """
+    Store the transition table in a file.
+    The entries of the file and the table are merged, the deeper entry wins and only the deepest constants.TT_FILE_SIZE are kept.
+    A file that was written for another board, seed or version is left alone.
+
+    Returns:
+    - None
+    """
+    path = board_size_path(constants.TT_FILE)
+    entries = {}
+    if transition_table.file is not None:
+        if transition_table.file.mismatch:
+            print(f"Transition table not stored, remove {path} to store it")
+            return
+        entries.update(transition_table.file.items())
+        transition_table.file.close()
+    for key, entry in transition_table.items():
+        if key not in entries or entry[0] >= entries[key][0]:
+            entries[key] = entry
+    if len(entries) > constants.TT_FILE_SIZE:
+        entries = dict(sorted(entries.items(), key=lambda item: item[1][0], reverse=True)[:constants.TT_FILE_SIZE])
+    
+    write_transition_table_file(path, entries)
+    transition_table.file = TranspositionTableFile(path)
+    print("Transition table stored in file")
+
+def get_opening_book() -> TranspositionTableFile:
+    """
+    Open the opening book written by opening_book.py.
+    The book has the layout of a transposition table file, every record holds the best move of a position of the first plies.
+
+    Returns:
+    - TranspositionTableFile: The opening book, empty if the file was not found
+    """
+    book = TranspositionTableFile(board_size_path(constants.OPENING_BOOK))
+    if book.count:
+        print(f"Opening book with {book.count} positions retrieved from file")
+    elif not book.mismatch:
+        print("Opening book not found")
+    return book
+
+
+def search_root(game: Game, transition_table: TranspositionTable, ai_player: int, depth: int, root_moves: list, deadline: float=None, ordering: MoveOrdering=None, pvs: bool=False, alfa: int=-constants.DEFAULT_BEST_SCORE, beta: int=constants.DEFAULT_BEST_SCORE) -> tuple:
+    """
+    Search all moves of the AI player to a fixed depth.
+    A best score at or below alfa or at or above beta means the search failed low or high and only bounds the real score.
+    
+    parameters:
+    - game (Game): The game state
+    - transition_table (TranspositionTable): The transition table
+    - ai_player (int): The AI player
+    - depth (int): The number of plies to search, including the move of the AI player
+    - root_moves (list): The moves of the AI player in the order they are searched
+    - deadline (float): time.perf_counter() time at which SearchTimeout is raised
+    - ordering (MoveOrdering): The move ordering used below the root
+    - pvs (bool): True to use principal variation search
+    - alfa (int): The lower end of the window
+    - beta (int): The upper end of the window
+    
+    Returns:
+    - tuple: (best_score, best_move, scores) where scores maps every searched move to its score
+    """
+    bestScore = -constants.DEFAULT_BEST_SCORE
+    bestmove = root_moves[0]
+    scores = {}
+    
+    alfa_window = alfa
+    for move in root_moves:
+        dest_x_axis, dest_y_axis = move
+        game.make_move(dest_x_axis, dest_y_axis, ai_player)
+        
+        if pvs and scores:
+            score = MiniMax(game, 0, alfa, alfa + 1, False, transition_table, depth - 1, deadline, ordering, pvs)
+            if alfa < score < beta:
+                score = MiniMax(game, 0, alfa, beta, False, transition_table, depth - 1, deadline, ordering, pvs)
+        else:
+            score = MiniMax(game, 0, alfa, beta, False, transition_table, depth - 1, deadline, ordering, pvs)
+        scores[move] = score
+        if score > bestScore:
+            bestScore = score
+            bestmove = move
+        game.unmake_move()
+        if bestScore == constants.WINNING_SCORE or bestScore >= beta:
+            break
+        alfa = max(alfa, bestScore)
+        
+    #store the best move in the transition table
+    bound = constants.EXACT
+    if bestScore <= alfa_window:
+        bound = constants.UPPER_BOUND
+    elif bestScore >= beta:
+        bound = constants.LOWER_BOUND
+    store_entry_in_transition_table(game, depth, bestScore, bound, bestmove, transition_table)
+    return bestScore, bestmove, scores
+
+#the transposition table and move ordering of a worker process, used by the opening book
+worker_transition_table = None
+worker_ordering = None
+#id of a transposition table in the main process -> [transposition table, move ordering, search id] of the worker,
+#they are kept between the root moves the worker searches
+worker_tables = {}
+
+#settings in constants.py the workers search with, they are sent with every task so overrides in the main process reach the workers
+WORKER_SETTINGS = ("ENDGAME_MAX_REGION", "ENDGAME_CACHE_SIZE", "TT_SIZE", "TT_BUCKET_SIZE", "TT_REPLACEMENT")
+
+def initialize_worker(rows: int=None, cols: int=None) -> None:
+    """
+    Initialize a worker process of the parallel search.
+    
+    parameters:
+    - rows (int): The number of x_axis coordinates of the board, None to keep the size the worker started with
+    - cols (int): The number of y_axis coordinates of the board
+    
+    Returns:
+    - None
+    """
+    global worker_transition_table, worker_ordering
+    if rows is not None and (rows, cols) != (constants.ROWS, constants.COLS):
+        set_board_size(rows, cols)
+    worker_transition_table = TranspositionTable()
+    worker_ordering = MoveOrdering()
+
+def search_root_move(task: tuple) -> tuple:
+    """
+    Search a single root move in a worker process.
+    
+    parameters:
+    - task (tuple): (game, ai_player, move, depth, wall_deadline, pvs, alfa, beta, search, settings) where wall_deadline is a time.time() time
+                    because time.perf_counter() times can't be compared between processes, search is (table id, search id)
+                    of the transposition table in the main process and settings maps the names in WORKER_SETTINGS to their values
+
+    Returns:
+    - tuple: (move, score, nodes, seconds, pid) where score is None if the deadline passed before the move was searched
+             and seconds is the CPU time of the worker, so workers sharing a core don't count double
+    """
+    game, ai_player, move, depth, wall_deadline, pvs, alfa, beta, search, settings = task
+    table_id, search_id = search
+    for setting, value in settings.items():
+        setattr(constants, setting, value)
+    
+    tables = worker_tables.get(table_id)
+    if tables is None:
+        if len(worker_tables) >= constants.WORKER_TABLES:
+            del worker_tables[next(iter(worker_tables))]
+        tables = worker_tables[table_id] = [TranspositionTable(constants.TT_SIZE, constants.TT_BUCKET_SIZE, constants.TT_REPLACEMENT), MoveOrdering(), search_id]
+    elif tables[2] != search_id:
+        tables[0].new_search()
+        tables[1].new_search()
+        tables[2] = search_id
+    transition_table, ordering = tables[0], tables[1]
+    
+    start = time.process_time()
+    deadline = None if wall_deadline is None else time.perf_counter() + wall_deadline - time.time()
+    game.nodes = 0
+    game.make_move(move[0], move[1], ai_player)
+    try:
+        score = MiniMax(game, 0, alfa, beta, False, transition_table, depth - 1, deadline, ordering, pvs)
+    except SearchTimeout:
+        score = None
+    return move, score, game.nodes, time.process_time() - start, os.getpid()
+
+def start_worker_pool(workers: int=constants.WORKERS) -> multiprocessing.Pool:
+    """
+    Start the worker processes of the parallel search.
+    
+    parameters:
+    - workers (int): The number of worker processes
+
+    Returns:
+    - multiprocessing.Pool: The pool, close it when the game is over
+    """
+    return multiprocessing.Pool(workers, initializer=initialize_worker, initargs=(constants.ROWS, constants.COLS))
+
+def map_root_moves(pool: multiprocessing.Pool, tasks: list, worker_stats: dict=None) -> list:
+    """
+    Search root moves over the worker processes.
+    
+    parameters:
+    - pool (multiprocessing.Pool): The worker processes
+    - tasks (list): The tasks of search_root_move
+    - worker_stats (dict): Filled with pid -> [nodes, CPU seconds] of the workers
+
+    Returns:
+    - list: (move, score) of every task in the order the workers finish them
+    """
+    results = []
+    timed_out = False
+    for move, score, nodes, seconds, pid in pool.imap_unordered(search_root_move, tasks):
+        if worker_stats is not None:
+            stats = worker_stats.setdefault(pid, [0, 0.0])
+            stats[0] += nodes
+            stats[1] += seconds
+        if score is None:
+            timed_out = True
+        results.append((move, score))
+    if timed_out:
+        raise SearchTimeout
+    return results
+
+def parallel_search_root(pool: multiprocessing.Pool, game: Game, transition_table: TranspositionTable, ai_player: int, depth: int, root_moves: list, deadline: float=None, pvs: bool=False, alfa: int=-constants.DEFAULT_BEST_SCORE, beta: int=constants.DEFAULT_BEST_SCORE, worker_stats: dict=None) -> tuple:
+    """
+    Search all moves of the AI player to a fixed depth, with the root moves split over the worker processes.
+    The first move is searched on its own with the window alfa to beta, its score raises alfa for the other moves.
+    With pvs the other moves are searched at the same time with a null window, the moves that turn out better
+    are searched again with the full window. Without pvs they get the window from the new alfa to beta.
+    
+    parameters:
+    - pool (multiprocessing.Pool): The worker processes
+    - game (Game): The game state
+    - transition_table (TranspositionTable): The transition table, only the result of the root is stored in it
+    - ai_player (int): The AI player
+    - depth (int): The number of plies to search, including the move of the AI player
+    - root_moves (list): The moves of the AI player, the first moves are handed out first
+    - deadline (float): time.perf_counter() time at which SearchTimeout is raised
+    - pvs (bool): True to use principal variation search
+    - alfa (int): The lower end of the window
+    - beta (int): The upper end of the window
+    - worker_stats (dict): Filled with pid -> [nodes, CPU seconds] of the workers
+
+    Returns:
+    - tuple: (best_score, best_move, scores) where scores maps every searched move to its score
+    """
+    wall_deadline = None if deadline is None else time.time() + deadline - time.perf_counter()
+    search = (transition_table.id, transition_table.search_id)
+    settings = {setting: getattr(constants, setting) for setting in WORKER_SETTINGS}
+    alfa_window = alfa
+    
+    #the first move is expected to be the best, its score gives the other moves a narrower window
+    bestmove = root_moves[0]
+    bestScore = map_root_moves(pool, [(game, ai_player, bestmove, depth, wall_deadline, pvs, alfa, beta, search, settings)], worker_stats)[0][1]
+    scores = {bestmove: bestScore}
+    
+    if bestScore < beta and bestScore != constants.WINNING_SCORE and len(root_moves) > 1:
+        alfa = max(alfa, bestScore)
+        window = (alfa, alfa + 1) if pvs else (alfa, beta)
+        results = map_root_moves(pool, [(game, ai_player, move, depth, wall_deadline, pvs, *window, search, settings) for move in root_moves[1:]], worker_stats)
+        scores.update(results)
+        
+        #the moves that failed high on the null window are searched again, the first in the root moves is kept on a tie
+        better = [move for move in root_moves[1:] if scores[move] > alfa]
+        if pvs and better and alfa + 1 < beta:
+            scores.update(map_root_moves(pool, [(game, ai_player, move, depth, wall_deadline, pvs, alfa, beta, search, settings) for move in better], worker_stats))
+        for move in root_moves[1:]:
+            if scores[move] > bestScore:
+                bestScore = scores[move]
+                bestmove = move
+    
+    bound = constants.EXACT
+    if bestScore <= alfa_window:
+        bound = constants.UPPER_BOUND
+    elif bestScore >= beta:
+        bound = constants.LOWER_BOUND
+    store_entry_in_transition_table(game, depth, bestScore, bound, bestmove, transition_table)
+    return bestScore, bestmove, scores
+
+def iterative_deepening(game: Game, transition_table: TranspositionTable, ai_player: int, time_budget: float, ordering: MoveOrdering=None, pvs: bool=constants.PVS, pool: multiprocessing.Pool=None, worker_stats: dict=None, depth_limit: int=None) -> tuple:
+    """
+    Search depth 1, 2, 3 and onward until the time budget runs out.
+    The moves are searched in the order of the scores of the previous iteration, so the best move is searched first.
+    Every iteration after the first starts with an aspiration window around the score of the previous iteration,
+    the side of the window that fails is opened up and the iteration is searched again.
+    
+    parameters:
+    - game (Game): The game state
+    - transition_table (TranspositionTable): The transition table
+    - ai_player (int): The AI player
+    - time_budget (float): The number of seconds the search may take
+    - ordering (MoveOrdering): The move ordering, the killer moves and history carry over from one iteration to the next
+    - pvs (bool): True to use principal variation search
+    - pool (multiprocessing.Pool): Worker processes to split the root moves over, None to search in this process
+    - worker_stats (dict): Filled with pid -> [nodes, CPU seconds] of the workers when a pool is used
+    - depth_limit (int): The deepest iteration, None to search until the time budget runs out.
+                         Pass float("inf") as time budget to always search to this depth
+    
+    Returns:
+    - tuple: (best_move, depth) of the last completed iteration
+    """
+    deadline = time.perf_counter() + time_budget
+    root_moves = game.available_moves(ai_player)
+    
+    #the game can't last longer than the number of empty squares
+    max_depth = game.empty.bit_count()
+    if depth_limit is not None:
+        max_depth = min(max_depth, depth_limit)
+    
+    #an exact result from an earlier search is the result of the first iterations
+    best_move, depth, best_score = root_moves[0], 0, None
+    entry = get_entry_from_transition_table(game, transition_table)
+    if entry and entry[2] == constants.EXACT and entry[3] in root_moves:
+        best_move, depth, best_score = entry[3], entry[0], entry[1]
+        root_moves.remove(best_move)
+        root_moves.insert(0, best_move)
+    
+    #once the queens are cut off the longest path is played, no search needed
+    endgame = solve_endgame(game, ai_player)
+    if endgame:
+        return endgame[1], max_depth
+    
+    undo_depth = len(game.undo_stack)
+    while depth < max_depth:
+        alfa, beta = -constants.DEFAULT_BEST_SCORE, constants.DEFAULT_BEST_SCORE
+        if best_score is not None:
+            alfa, beta = best_score - constants.ASPIRATION_WINDOW, best_score + constants.ASPIRATION_WINDOW
+        try:
+            while True:
+                #the first iteration always finishes, so there is always a searched move
+                if pool is not None:
+                    score, move, scores = parallel_search_root(pool, game, transition_table, ai_player, depth + 1, root_moves, deadline if depth else None, pvs, alfa, beta, worker_stats)
+                else:
+                    score, move, scores = search_root(game, transition_table, ai_player, depth + 1, root_moves, deadline if depth else None, ordering, pvs, alfa, beta)
+                if score <= alfa:
+                    alfa = -constants.DEFAULT_BEST_SCORE
+                elif score >= beta:
+                    beta = constants.DEFAULT_BEST_SCORE
+                else:
+                    break
+                root_moves.remove(move)
+                root_moves.insert(0, move)
+        except SearchTimeout:
+            #the search stopped somewhere in the tree, take back the moves it made
+            while len(game.undo_stack) > undo_depth:
+                game.unmake_move()
+            break
+        best_score, best_move = score, move
+        depth += 1
+        
+        #a won or lost game does not change with a deeper search
+        if abs(best_score) == constants.WINNING_SCORE or time.perf_counter() > deadline:
+            break
+        root_moves.sort(key=lambda move: scores.get(move, -constants.DEFAULT_BEST_SCORE), reverse=True)
+        
+    return best_move, depth
+
+class MCTSNode():
+    def __init__(self, move: tuple, player: int, key: int):
+        """
+        A position in the tree of the Monte Carlo tree search.
+        
+        parameters:
+        - move (tuple): The move that leads to the position as (x_axis, y_axis), None for the root
+        - player (int): The player to move in the position
+        - key (int): The Zobrist hash of the position
+        """
+        self.move = move
+        self.player = player
+        self.key = key
+        self.children = []
+        self.untried_moves = None #moves without a child yet, filled the first time the node is reached
+        self.visits = 0
+        self.wins = 0 #playouts won by the player that made the move to this position
+        self.winner = constants.EMPTY #winner of a position with queens that are cut off, solved exactly instead of played out
+        
+    def best_child(self, exploration: float) -> "MCTSNode":
+        """
+        Get the child with the highest UCT score: the win rate plus a bonus for children that are visited less often.
+        
+        parameters:
+        - exploration (float): The exploration constant, 0 to pick the child with the highest win rate
+
+        Returns:
+        - MCTSNode: The child to visit
+        """
+        log_visits = math.log(self.visits)
+        return max(self.children, key=lambda child: child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits))
+    
+    def principal_variation(self) -> int:
+        """
+        Get the length of the line of most visited children, the depth the tree has searched the expected line to.
+
+        Returns:
+        - int: The number of moves in the line
+        """
+        length, node = 0, self
+        while node.children:
+            node = max(node.children, key=lambda child: child.visits)
+            length += 1
+        return length
+
+class MonteCarloTreeSearch():
+    def __init__(self, seed: int=None):
+        """
+        Monte Carlo tree search with UCT, an alternative to MiniMax that needs no evaluation function.
+        Every playout walks the tree to a new position and plays the game out on bitboards,
+        the win rates in the tree decide which moves are played out more often.
+        The tree is kept between moves, the part under the position of the next search is reused.
+        
+        parameters:
+        - seed (int): The seed of the random moves, None for a random seed
+        """
+        self.root = None
+        self.rng = random.Random(seed)
+        self.playouts = 0 #playouts of the last search
+        self.playout_moves = 0 #moves played in the playouts of the last search
+        
+    def find_root(self, game: Game, ai_player: int) -> MCTSNode:
+        """
+        Get the node of the game state, the node is looked up in the tree up to 2 moves under the old root.
+        The rest of the tree is dropped.
+        
+        parameters:
+        - game (Game): The game state
+        - ai_player (int): The player to move
+
+        Returns:
+        - MCTSNode: The root of the search
+        """
+        nodes = [self.root] if self.root is not None else []
+        for depth in range(3):
+            for node in nodes:
+                if node.key == game.hash and node.player == ai_player:
+                    return node
+            nodes = [child for node in nodes for child in node.children]
+        return MCTSNode(None, ai_player, game.hash)
+    
+    def playout(self, empty: int, squares: list, player: int) -> int:
+        """
+        Play the game out with constants.MCTS_PLAYOUT_POLICY moves until a player is stuck.
+        Only the empty squares and the squares of the queens are kept, the moves are looked up in RAY_TABLES.
+        
+        parameters:
+        - empty (int): Bitmask of the empty squares
+        - squares (list): The square index of the queen of player 1 at index 1 and of player 2 at index 2
+        - player (int): The player to move
+
+        Returns:
+        - int: The winner
+        """
+        random_number = self.rng.random
+        mobility = constants.MCTS_PLAYOUT_POLICY == constants.MOBILITY_PLAYOUT
+        moves_played = 0
+        while True:
+            moves = []
+            for ray_mask, ray_moves in RAY_TABLES[squares[player]]:
+                moves.extend(ray_moves[empty & ray_mask])
+            other_player = constants.PLAYER1 if player == constants.PLAYER2 else constants.PLAYER2
+            if not moves:
+                self.playout_moves += moves_played
+                return other_player
+            
+            dest_x_axis, dest_y_axis = moves[int(random_number() * len(moves))]
+            dest = dest_x_axis * constants.COLS + dest_y_axis
+            if mobility and len(moves) > 1:
+                #count the moves the other player has left after a second random move and keep the move that leaves fewer
+                other_x_axis, other_y_axis = moves[int(random_number() * len(moves))]
+                other_dest = other_x_axis * constants.COLS + other_y_axis
+                if other_dest != dest:
+                    replies = [0, 0]
+                    for index, square in enumerate((dest, other_dest)):
+                        after = empty & ~(1 << square)
+                        for ray_mask, ray_moves in RAY_TABLES[squares[other_player]]:
+                            replies[index] += len(ray_moves[after & ray_mask])
+                    if replies[1] < replies[0]:
+                        dest = other_dest
+            
+            #the origin of the queen is destroyed, it was not empty already, so only the destination changes
+            empty &= ~(1 << dest)
+            squares[player] = dest
+            player = other_player
+            moves_played += 1
+            
+    def search(self, game: Game, ai_player: int, time_budget: float, playouts: int=None, stop: threading.Event=None) -> tuple:
+        """
+        Run playouts from the game state until the budget runs out and get the most visited move.
+        Once the queens are cut off the longest path is played like iterative_deepening does, without playouts.
+        The moves made in the tree and in the playouts are added to game.nodes.
+        
+        parameters:
+        - game (Game): The game state, the moves of the tree are made and unmade on it
+        - ai_player (int): The player to move
+        - time_budget (float): The number of seconds the search may take
+        - playouts (int): The number of playouts, None for constants.MCTS_PLAYOUTS. 0 to play out until the time budget runs out
+        - stop (threading.Event): Stops the search early once it is set, None to search for the whole budget
+
+        Returns:
+        - tuple: (best_move, depth) the most visited move and the length of the line of most visited moves
+        """
+        if playouts is None:
+            playouts = constants.MCTS_PLAYOUTS
+        deadline = time.perf_counter() + time_budget
+        root = self.root = self.find_root(game, ai_player)
+        undo_depth = len(game.undo_stack)
+        self.playouts, self.playout_moves = 0, 0
+        
+        endgame = solve_endgame(game, ai_player)
+        if endgame:
+            return endgame[1], game.empty.bit_count()
+        
+        while not (playouts and self.playouts >= playouts):
+            if (not playouts and time.perf_counter() > deadline) or (stop is not None and stop.is_set()):
+                break
+            #selection: follow the UCT scores to a node that still has moves without a child
+            node, path = root, [root]
+            while not node.winner:
+                if node.untried_moves is None:
+                    node.untried_moves = game.available_moves(node.player)
+                    self.rng.shuffle(node.untried_moves)
+                if node.untried_moves or not node.children:
+                    break
+                node = node.best_child(constants.MCTS_EXPLORATION)
+                game.make_move(node.move[0], node.move[1], path[-1].player)
+                path.append(node)
+            
+            #expansion: a player without moves has lost, otherwise one new child is added
+            other_player = constants.PLAYER1 if node.player == constants.PLAYER2 else constants.PLAYER2
+            if node.winner:
+                winner = node.winner
+            elif not node.untried_moves:
+                winner = other_player
+            else:
+                move = node.untried_moves.pop()
+                game.make_move(move[0], move[1], node.player)
+                child = MCTSNode(move, other_player, game.hash)
+                node.children.append(child)
+                path.append(child)
+                #simulation: a position with queens that are cut off is solved, the others are played out on bitboards
+                endgame = solve_endgame(game, other_player)
+                if endgame:
+                    winner = child.winner = endgame[0]
+                else:
+                    squares = [None] + [x_axis * constants.COLS + y_axis for x_axis, y_axis in game.positions[1:]]
+                    winner = self.playout(game.empty, squares, other_player)
+            
+            #backpropagation: every node counts the wins of the player that moved to it
+            for visited in path:
+                visited.visits += 1
+                if winner != visited.player:
+                    visited.wins += 1
+            while len(game.undo_stack) > undo_depth:
+                game.unmake_move()
+            self.playouts += 1
+        game.nodes += self.playout_moves
+        
+        if not root.children:
+            return game.available_moves(ai_player)[0], 0
+        best = max(root.children, key=lambda child: child.visits)
+        return best.move, root.principal_variation()
+
+def choose_ai_move(game, transition_table, ai_player: int=constants.PLAYER2, time_budget: float=constants.MOVE_TIME, ordering: MoveOrdering=None, pool: multiprocessing.Pool=None, verbose: bool=True, stats: SearchStats=None, book: TranspositionTableFile=None, tree: MonteCarloTreeSearch=None) -> tuple:
+    """
+    Search the best move for the AI without making it, with the engine of constants.AI_ENGINE.
+    A position in the opening book is answered from the book without searching.
+    
+    parameters:
+    - game (Game): The game state
+    - transition_table (TranspositionTable): The transition table
+    - ai_player (int): The AI player
+    - time_budget (float): The number of seconds the AI may search
+    - ordering (MoveOrdering): The move ordering, pass the same one every move to keep the history between moves
+    - pool (multiprocessing.Pool): Worker processes to split the root moves over, None to search in this process
+    - verbose (bool): True to print the depth and the statistics of the search
+    - stats (SearchStats): Collects the statistics of the search, None to search without collecting them.
+                           With a pool only the root is seen, the workers search in their own processes and report their nodes separately
+    - book (TranspositionTableFile): The opening book, None to always search
+    - tree (MonteCarloTreeSearch): The tree of the Monte Carlo tree search, pass the same one every move to reuse it between moves.
+                                   Only used by constants.MCTS, which uses no transition table, move ordering, pool or stats
+    
+    Returns:
+    - tuple: (best_move, depth), the best move as (x_axis, y_axis) and the depth it was searched to, 0 for a move from the book.
+             For constants.MCTS the depth is the length of the line of most visited moves
+    """    
+    if book is not None:
+        entry = book.get(game.hash)
+        if entry and entry[3] in game.available_moves(ai_player):
+            if verbose:
+                print(f"AI played from the opening book, searched to depth {entry[0]}")
+            return entry[3], 0
+    
+    if constants.AI_ENGINE == constants.MCTS:
+        if tree is None:
+            tree = MonteCarloTreeSearch()
+        start = time.perf_counter()
+        best_move, depth = tree.search(game, ai_player, time_budget)
+        seconds = time.perf_counter() - start
+        if verbose:
+            print(f"AI played out {tree.playouts} games, {tree.playouts / seconds if seconds else 0:.0f} playouts/s, most visited line {depth} moves deep")
+        return best_move, depth
+    
+    transition_table.new_search()
+    if ordering is None:
+        ordering = MoveOrdering()
+    ordering.new_search()
+    
+    start = time.perf_counter()
+    worker_stats = {}
+    if stats is not None:
+        transition_table, ordering = stats.instrument(game, transition_table, ordering)
+    try:
+        best_move, depth = iterative_deepening(game, transition_table, ai_player, time_budget, ordering, constants.PVS, pool, worker_stats)
+    finally:
+        if stats is not None:
+            stats.release(game)
+    #the workers made the moves below the root, they count as nodes of the search
+    worker_nodes = sum(nodes for nodes, seconds in worker_stats.values())
+    game.nodes += worker_nodes
+    if stats is not None:
+        stats.worker_nodes += worker_nodes
+    if verbose and stats is not None:
+        stats.report(depth)
+    if verbose and pool is None:
+        print(f"AI searched to depth {depth}, first move cutoffs: {ordering.first_move_cutoff_rate():.0%}")
+    elif verbose:
+        #the utilisation is the CPU time the workers searched together compared to the time the search took,
+        #it is not a speedup: parallel_benchmark.py compares the search with a serial search of the same depth
+        seconds = time.perf_counter() - start
+        busy = sum(seconds for nodes, seconds in worker_stats.values())
+        print(f"AI searched to depth {depth} with {len(worker_stats)} workers, {worker_nodes} nodes, worker utilisation: {busy / seconds if seconds else 0:.1f}x")
+        for worker, (pid, (nodes, worker_seconds)) in enumerate(sorted(worker_stats.items())):
+            print(f"  worker {worker}: {nodes} nodes, {nodes / worker_seconds if worker_seconds else 0:.0f} nodes/s")
+    return best_move, depth
+
+def ai_move(game, transition_table, ai_player: int=constants.PLAYER2, time_budget: float=constants.MOVE_TIME, ordering: MoveOrdering=None, pool: multiprocessing.Pool=None, stats: SearchStats=None, book: TranspositionTableFile=None, tree: MonteCarloTreeSearch=None) -> None: #Should be reworked to use current player instead of constants.PLAYER2
+    """
+    Make the AI move.
+    
+    parameters:
+    - game (Game): The game state
+    - transition_table (TranspositionTable): The transition table
+    - ai_player (int): The AI player
+    - time_budget (float): The number of seconds the AI may search
+    - ordering (MoveOrdering): The move ordering, pass the same one every move to keep the history between moves
+    - pool (multiprocessing.Pool): Worker processes to split the root moves over, None to search in this process
+    - stats (SearchStats): Collects and reports the statistics of the search, None to search without collecting them
+    - book (TranspositionTableFile): The opening book, None to always search
+    - tree (MonteCarloTreeSearch): The tree of the Monte Carlo tree search, pass the same one every move to reuse it between moves
+    
+    Returns:
+    - None
+    """    
+    best_move, depth = choose_ai_move(game, transition_table, ai_player, time_budget, ordering, pool, stats=stats, book=book, tree=tree)
+    player_x_axis, player_y_axis = game.getplayer()
+    game.move(player_x_axis, player_y_axis, best_move[0], best_move[1])
+
+class BackgroundSearch():
+    def __init__(self, transition_table: TranspositionTable, pool: multiprocessing.Pool=None, book: TranspositionTableFile=None, on_done=None):
+        """
+        Run the AI search on a background thread so the game loop keeps drawing and handling events.
+        Only one search can be in flight, the move it finds is applied by the game loop with apply_result.
+        While the human thinks the thread ponders: it searches the replies of the human, so the
+        transition table already holds the position the AI has to move in when the real move arrives.
+        
+        parameters:
+        - transition_table (TranspositionTable): The transition table, only the background thread uses it while a search is in flight
+        - pool (multiprocessing.Pool): Worker processes to split the root moves over, None to search on the background thread
+        - book (TranspositionTableFile): The opening book, None to always search
+        - on_done (function): Called without arguments on the background thread when a search or ponder finishes,
+                              so a game loop that waits for events can be woken up
+        """
+        self.transition_table = transition_table
+        self.pool = pool
+        self.book = book
+        self.on_done = on_done
+        self.ordering = MoveOrdering()
+        self.tree = MonteCarloTreeSearch() #used instead of the transition table when constants.AI_ENGINE is constants.MCTS
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.future = None #the search or ponder in flight, None if there is none
+        self.search_hash = None #hash of the game state the search in flight was started for
+        self.pondering = False #True while the future in flight is a ponder
+        self.stop_pondering = threading.Event()
+        self.last_depth = 0 #depth the last real search reached, a pondered position searched this deep is played at once
+        
+    def start(self, game: Game, ai_player: int) -> bool:
+        """
+        Start searching the move of the AI player, unless a search is already in flight.
+        The search runs on a copy, so the game can be drawn while the AI thinks.
+        A ponder in flight is stopped first, the search starts once it has stopped.
+        If pondering already searched this position as deep as the last search, its move is played without searching.
+        
+        parameters:
+        - game (Game): The game state
+        - ai_player (int): The AI player
+
+        Returns:
+        - bool: True if a search was started, False if one was already in flight
+        """
+        if self.future is not None:
+            if not self.pondering:
+                return False
+            #the pondered positions stay in the transition table, only the ponder itself is stopped
+            self.stop_pondering.set()
+            if not self.future.done():
+                return False
+            self.future = None
+            self.pondering = False
+        self.search_hash = game.hash
+        
+        #the tree of the Monte Carlo tree search keeps what was pondered, the transition table only holds MiniMax results
+        entry = get_entry_from_transition_table(game, self.transition_table) if constants.AI_ENGINE == constants.MINIMAX else None
+        if entry and entry[2] == constants.EXACT and self.last_depth and entry[0] >= self.last_depth and entry[3] in game.available_moves(ai_player):
+            print(f"AI answered from pondering at depth {entry[0]}")
+            self.future = Future()
+            self.future.set_result(entry[3])
+        else:
+            self.future = self.executor.submit(self.search, game.copy(), ai_player)
+        if self.on_done is not None:
+            self.future.add_done_callback(lambda future: self.on_done())
+        return True
+    
+    def search(self, game: Game, ai_player: int) -> tuple:
+        """
+        Search the move of the AI player, runs on the background thread.
+        
+        parameters:
+        - game (Game): A copy of the game state
+        - ai_player (int): The AI player
+
+        Returns:
+        - tuple: The best move as (x_axis, y_axis)
+        """
+        stats = SearchStats() if constants.SEARCH_STATS else None
+        best_move, depth = choose_ai_move(game, self.transition_table, ai_player, constants.MOVE_TIME, self.ordering, self.pool, stats=stats, book=self.book, tree=self.tree)
+        if depth:
+            self.last_depth = depth
+        return best_move
+    
+    def ponder(self, game: Game, ai_player: int) -> bool:
+        """
+        Start pondering on the turn of the human, unless a search or ponder is already in flight.
+        
+        parameters:
+        - game (Game): The game state, the human is to move
+        - ai_player (int): The AI player
+
+        Returns:
+        - bool: True if pondering was started
+        """
+        if self.future is not None or not constants.PONDER:
+            return False
+        self.stop_pondering.clear()
+        self.pondering = True
+        self.future = self.executor.submit(self.ponder_replies, game.copy(), ai_player)
+        if self.on_done is not None:
+            self.future.add_done_callback(lambda future: self.on_done())
+        return True
+    
+    def ponder_replies(self, game: Game, ai_player: int) -> None:
+        """
+        Search the positions after the likely replies of the human until start stops the ponder, runs on the background thread.
+        The reply the last search expected comes first, then the replies that leave the human the most moves compared to the AI,
+        all replies are pondered when there are at most constants.PONDER_REPLIES. A reply is searched in slices of
+        constants.PONDER_SLICE seconds until it is as deep as the last search, then the next reply gets its turn,
+        every slice continues from the exact result of the last one in the transition table.
+        Once every reply is one deeper than the last search, or after constants.PONDER_TIME seconds, the ponder stops.
+        With constants.MCTS the tree is grown from the position of the human instead, the search reuses the part under the reply.
+        
+        parameters:
+        - game (Game): A copy of the game state, the human is to move
+        - ai_player (int): The AI player
+
+        Returns:
+        - None
+        """
+        human_player = constants.PLAYER1 if ai_player == constants.PLAYER2 else constants.PLAYER2
+        if constants.AI_ENGINE == constants.MCTS:
+            self.tree.search(game, human_player, float("inf"), constants.MCTS_PONDER_PLAYOUTS, self.stop_pondering)
+            return
+        self.transition_table.new_search()
+        self.ordering.new_search()
+        
+        entry = get_entry_from_transition_table(game, self.transition_table)
+        expected_reply = entry[3] if entry else None
+        replies = []
+        for reply in game.available_moves(human_player):
+            position = game.copy()
+            player_x_axis, player_y_axis = position.getplayer()
+            position.move(player_x_axis, player_y_axis, reply[0], reply[1])
+            if not position.is_game_over():
+                replies.append((reply != expected_reply, -position.evaluate(human_player)[1], position))
+        replies.sort(key=lambda reply: reply[:2])
+        positions = [position for expected, score, position in replies[:constants.PONDER_REPLIES]]
+        depths = [0] * len(positions)
+        
+        #a reply searched deeper than the next search would reach is not played any sooner, so the ponder stops there
+        deadline = time.perf_counter() + constants.PONDER_TIME
+        target_depth = max(self.last_depth, 1)
+        while not self.stop_pondering.is_set() and time.perf_counter() < deadline:
+            #deepen the first reply that is not as deep as the target yet
+            shallow = [index for index in range(len(positions)) if depths[index] < min(target_depth, positions[index].empty.bit_count())]
+            if not shallow:
+                if target_depth > max(self.last_depth, 1):
+                    return
+                target_depth += 1
+                continue
+            index = shallow[0]
+            best_move, depths[index] = iterative_deepening(positions[index], self.transition_table, ai_player, constants.PONDER_SLICE, self.ordering, constants.PVS, self.pool)
+
+    def apply_result(self, game: Game) -> bool:
+        """
+        Make the move of a finished search, called from the game loop.
+        The move is dropped if the game changed since the search was started.
+        
+        parameters:
+        - game (Game): The game state
+
+        Returns:
+        - bool: True if a move was made
+        """
+        if self.future is None or self.pondering or not self.future.done():
+            return False
+        best_move = self.future.result()
+        self.future = None
+        if game.hash != self.search_hash:
+            return False
+        player_x_axis, player_y_axis = game.getplayer()
+        return game.move(player_x_axis, player_y_axis, best_move[0], best_move[1])
+    
+    def shutdown(self) -> None:
+        """
+        Stop pondering, wait for the search in flight and stop the background thread.
+        
+        Returns:
+        - None
+        """
+        self.stop_pondering.set()
+        self.executor.shutdown(wait=True)
+        self.future = None
+        self.pondering = False
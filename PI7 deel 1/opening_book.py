@@ -0,0 +1,98 @@
+import argparse
+import multiprocessing
+import time
+import constants
+import engine
+
+def book_positions(plies: int) -> list:
+    """
+    Get the positions of the first plies, positions that are reached by more than one move order are only kept once.
+
+    parameters:
+    - plies (int): The number of plies the book covers, the start position is ply 0
+
+    Returns:
+    - list: The moves that lead to every position, in the order the positions are reached
+    """
+    positions = [[]]
+    seen = {engine.start_game().hash}
+    layer = [[]]
+    for ply in range(1, plies):
+        next_layer = []
+        for moves in layer:
+            game = engine.start_game()
+            for move in moves:
+                player_x_axis, player_y_axis = game.getplayer()
+                game.move(player_x_axis, player_y_axis, move[0], move[1])
+            player_x_axis, player_y_axis = game.getplayer()
+            for move in game.available_moves():
+                child = game.copy()
+                child.move(player_x_axis, player_y_axis, move[0], move[1])
+                if child.hash not in seen and not child.is_game_over():
+                    seen.add(child.hash)
+                    next_layer.append(moves + [move])
+        positions.extend(next_layer)
+        layer = next_layer
+    return positions
+
+def search_book_position(task: tuple) -> tuple:
+    """
+    Search a position of the book in a worker process, every worker keeps its own transition table over the positions it searches.
+
+    parameters:
+    - task (tuple): (moves, time_budget) where moves lead from the start position to the position
+
+    Returns:
+    - tuple: (key, (depth, score, bound, best_move)) the record of the position
+    """
+    moves, time_budget = task
+    game = engine.start_game()
+    for move in moves:
+        player_x_axis, player_y_axis = game.getplayer()
+        game.move(player_x_axis, player_y_axis, move[0], move[1])
+
+    engine.worker_transition_table.new_search()
+    engine.worker_ordering.new_search()
+    best_move, depth = engine.iterative_deepening(game, engine.worker_transition_table, game.turn, time_budget, engine.worker_ordering, constants.PVS)
+    entry = engine.worker_transition_table.get(game.hash)
+    score = entry[1] if entry and entry[3] == best_move else 0
+    return game.hash, (depth, score, constants.EXACT, best_move)
+
+def build_opening_book(plies: int, time_budget: float, workers: int) -> None:
+    """
+    Search the positions of the first plies over a pool of worker processes and write the best moves to the opening book of the board size.
+
+    parameters:
+    - plies (int): The number of plies the book covers
+    - time_budget (float): The number of seconds every position is searched
+    - workers (int): The number of worker processes
+
+    Returns:
+    - None
+    """
+    positions = book_positions(plies)
+    print(f"Searching {len(positions)} positions for {time_budget}s each with {workers} workers")
+
+    start = time.perf_counter()
+    entries = {}
+    with multiprocessing.Pool(workers, initializer=engine.initialize_worker, initargs=(constants.ROWS, constants.COLS)) as pool:
+        for key, entry in pool.imap_unordered(search_book_position, [(moves, time_budget) for moves in positions]):
+            entries[key] = entry
+            if len(entries) % 25 == 0 or len(entries) == len(positions):
+                print(f"  {len(entries)}/{len(positions)} positions, {time.perf_counter() - start:.0f}s")
+
+    #every board size has its own book, building the book of one size leaves the books of the other sizes alone
+    path = engine.board_size_path(constants.OPENING_BOOK)
+    engine.write_transition_table_file(path, entries)
+    print(f"Opening book with {len(entries)} positions stored in {path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the opening book by searching the positions of the first plies.")
+    parser.add_argument("--plies", type=int, default=3, help="number of plies the book covers")
+    parser.add_argument("--time", type=float, default=10.0, help="seconds every position is searched")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count(), help="number of worker processes")
+    parser.add_argument("--size", default=f"{constants.ROWS}x{constants.COLS}", help="board size as ROWSxCOLS")
+    arguments = parser.parse_args()
+    engine.set_board_size(*engine.parse_board_size(arguments.size))
+
+    build_opening_book(arguments.plies, arguments.time, arguments.workers)
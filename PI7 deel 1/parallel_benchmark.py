@@ -0,0 +1,79 @@
+import argparse
+import random
+import time
+import constants
+import engine
+
+def benchmark_position(game: engine.Game, transition_table: engine.TranspositionTable, depth: int, pool) -> tuple:
+    """
+    Search a position to a fixed depth, serially or over a worker pool, like choose_ai_move starts a new search.
+
+    parameters:
+    - game (Game): The game state
+    - transition_table (TranspositionTable): The transition table of the serial or the parallel search
+    - depth (int): The depth the position is searched to
+    - pool (multiprocessing.Pool): The worker processes, None to search serially
+
+    Returns:
+    - tuple: (best_move, seconds, nodes)
+    """
+    #a new search also makes the workers start a new search on their own transition tables
+    transition_table.new_search()
+    ordering = engine.MoveOrdering()
+    worker_stats = {}
+    game.nodes = 0
+    start = time.perf_counter()
+    best_move, reached = engine.iterative_deepening(game, transition_table, game.turn, float("inf"), ordering, constants.PVS, pool, worker_stats, depth_limit=depth)
+    seconds = time.perf_counter() - start
+    nodes = sum(stats[0] for stats in worker_stats.values()) if pool is not None else game.nodes
+    return best_move, seconds, nodes
+
+def parallel_benchmark(workers: int, depth: int, positions: int, seed: int) -> None:
+    """
+    Compare the parallel root search with a serial search of the same depth and print the speedup and the extra nodes.
+    The positions are reached by random moves from the start position.
+
+    parameters:
+    - workers (int): The number of worker processes
+    - depth (int): The depth every position is searched to
+    - positions (int): The number of positions
+    - seed (int): The seed of the random moves
+
+    Returns:
+    - None
+    """
+    rng = random.Random(seed)
+    pool = engine.start_worker_pool(workers)
+    serial_table, parallel_table = engine.TranspositionTable(), engine.TranspositionTable()
+    serial_seconds = parallel_seconds = serial_nodes = parallel_nodes = 0
+    try:
+        for position in range(positions):
+            game = engine.start_game()
+            for move in range(2 + position):
+                player_x_axis, player_y_axis = game.getplayer()
+                game.move(player_x_axis, player_y_axis, *rng.choice(game.available_moves()))
+            if game.is_game_over():
+                break
+            serial_move, serial_time, serial_count = benchmark_position(game, serial_table, depth, None)
+            parallel_move, parallel_time, parallel_count = benchmark_position(game, parallel_table, depth, pool)
+            serial_seconds += serial_time
+            parallel_seconds += parallel_time
+            serial_nodes += serial_count
+            parallel_nodes += parallel_count
+            print(f"position {position + 1}: serial {serial_time:.2f}s {serial_count} nodes {serial_move}, "
+                  f"parallel {parallel_time:.2f}s {parallel_count} nodes {parallel_move}")
+    finally:
+        pool.close()
+        pool.join()
+    print(f"{workers} workers at depth {depth}: speedup {serial_seconds / parallel_seconds if parallel_seconds else 0:.2f}x, "
+          f"{parallel_nodes / serial_nodes if serial_nodes else 0:.2f}x the nodes of the serial search")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the parallel root search with a serial search of the same depth.")
+    parser.add_argument("--workers", type=int, default=4, help="number of worker processes")
+    parser.add_argument("--depth", type=int, default=7, help="depth every position is searched to")
+    parser.add_argument("--positions", type=int, default=5, help="number of positions")
+    parser.add_argument("--seed", type=int, default=constants.SEED, help="seed of the random moves that lead to the positions")
+    arguments = parser.parse_args()
+
+    parallel_benchmark(arguments.workers, arguments.depth, arguments.positions, arguments.seed)
@@ -0,0 +1,190 @@
+import argparse
+import csv
+import random
+import time
+import constants
+import engine
+
+#engine configurations, every entry overrides settings in constants.py while that engine searches
+CONFIGS = {
+    "default": {},
+    "no-pvs": {"PVS": False},
+    "no-aspiration": {"ASPIRATION_WINDOW": constants.DEFAULT_BEST_SCORE},
+    "no-endgame": {"ENDGAME_MAX_REGION": 0},
+    "always-replace": {"TT_REPLACEMENT": constants.ALWAYS_REPLACE},
+    "small-tt": {"TT_SIZE": 2**12},
+    "mcts": {"AI_ENGINE": constants.MCTS},
+    "mcts-random": {"AI_ENGINE": constants.MCTS, "MCTS_PLAYOUT_POLICY": constants.RANDOM_PLAYOUT},
+}
+
+class Engine():
+    def __init__(self, name: str, time_budget: float, stats: bool=False, pool=None):
+        """
+        An engine configuration with its own transition table, move ordering and Monte Carlo tree, so the two sides don't share knowledge.
+
+        parameters:
+        - name (str): The name of the configuration in CONFIGS
+        - time_budget (float): The number of seconds the engine may search a move
+        - stats (bool): True to print the search statistics of every move
+        - pool (multiprocessing.Pool): Worker processes to split the root moves over, None to search in this process
+        """
+        self.name = name
+        self.settings = CONFIGS[name]
+        self.time_budget = time_budget
+        self.stats = stats
+        self.pool = pool
+        self.transition_table = engine.TranspositionTable(self.settings.get("TT_SIZE", constants.TT_SIZE),
+                                                         self.settings.get("TT_BUCKET_SIZE", constants.TT_BUCKET_SIZE),
+                                                         self.settings.get("TT_REPLACEMENT", constants.TT_REPLACEMENT))
+        self.ordering = engine.MoveOrdering()
+        self.tree = engine.MonteCarloTreeSearch()
+
+    def search(self, game) -> tuple:
+        """
+        Search the move of the player to move with the settings of this configuration.
+
+        parameters:
+        - game (Game): The game state
+
+        Returns:
+        - tuple: (best_move, depth, nodes, seconds)
+        """
+        defaults = {setting: getattr(constants, setting) for setting in self.settings}
+        for setting, value in self.settings.items():
+            setattr(constants, setting, value)
+        try:
+            game.nodes = 0
+            start = time.perf_counter()
+            stats = engine.SearchStats() if self.stats else None
+            best_move, depth = engine.choose_ai_move(game, self.transition_table, game.turn, self.time_budget, self.ordering, self.pool, verbose=self.stats, stats=stats, tree=self.tree)
+            seconds = time.perf_counter() - start
+        finally:
+            for setting, value in defaults.items():
+                setattr(constants, setting, value)
+        return best_move, depth, game.nodes, seconds
+
+def play_game(engines: list, seed: int, opening_moves: int) -> tuple:
+    """
+    Play a game between two engine configurations, starting with random moves so every seed gives a different game.
+
+    parameters:
+    - engines (list): The Engine of constants.PLAYER1 and the Engine of constants.PLAYER2
+    - seed (int): The seed of the random opening moves
+    - opening_moves (int): The number of random moves played before the engines take over
+
+    Returns:
+    - tuple: (winner, records) where records holds a dict per engine move
+    """
+    rng = random.Random(seed)
+    game = engine.start_game()
+
+    records = []
+    while not game.is_game_over():
+        player = game.turn
+        player_x_axis, player_y_axis = game.getplayer()
+        if game.moves < opening_moves:
+            game.move(player_x_axis, player_y_axis, *rng.choice(game.available_moves()))
+            continue
+
+        current = engines[player - 1]
+        best_move, depth, nodes, seconds = current.search(game)
+        game.move(player_x_axis, player_y_axis, best_move[0], best_move[1])
+        records.append({"seed": seed, "ply": game.moves, "engine": current.name, "player": player, "move": best_move,
+                        "depth": depth, "nodes": nodes, "seconds": seconds, "nps": nodes / seconds if seconds else 0})
+    return game.winner, records
+
+def self_play(first: str, second: str, games: int, seed: int, time_budget: float, opening_moves: int, csv_file: str=None, stats: bool=False, workers: int=1) -> None:
+    """
+    Play games between two engine configurations and print the depth, nodes and nodes per second of every move.
+    The configurations swap colours every game, both colours play every seed once when games is even.
+
+    parameters:
+    - first (str): The name of the first configuration
+    - second (str): The name of the second configuration
+    - games (int): The number of games
+    - seed (int): The seed of the first game, game n uses seed + n // 2
+    - time_budget (float): The number of seconds an engine may search a move
+    - opening_moves (int): The number of random moves played before the engines take over
+    - csv_file (str): The file the moves are written to, None to only print them
+    - stats (bool): True to print the search statistics of every move
+    - workers (int): The number of worker processes the root moves are split over, 1 searches in this process.
+                     With more workers the nodes of a move are only counted by the workers
+
+    Returns:
+    - None
+    """
+    pool = engine.start_worker_pool(workers) if workers > 1 else None
+    try:
+        play_games(first, second, games, seed, time_budget, opening_moves, csv_file, stats, pool)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+def play_games(first: str, second: str, games: int, seed: int, time_budget: float, opening_moves: int, csv_file: str, stats: bool, pool) -> None:
+    """
+    Play the games of self_play with the engines sharing a worker pool.
+    The workers keep a transition table per engine and search with the settings of the engine that sent the root move.
+
+    parameters:
+    - first (str): The name of the first configuration
+    - second (str): The name of the second configuration
+    - games (int): The number of games
+    - seed (int): The seed of the first game
+    - time_budget (float): The number of seconds an engine may search a move
+    - opening_moves (int): The number of random moves played before the engines take over
+    - csv_file (str): The file the moves are written to, None to only print them
+    - stats (bool): True to print the search statistics of every move
+    - pool (multiprocessing.Pool): Worker processes to split the root moves over, None to search in this process
+
+    Returns:
+    - None
+    """
+    engines = [Engine(first, time_budget, stats, pool), Engine(second, time_budget, stats, pool)]
+    wins = {first: 0, second: 0}
+    all_records = []
+
+    for game_index in range(games):
+        players = engines if game_index % 2 == 0 else engines[::-1]
+        names = [player.name for player in players]
+        winner, records = play_game(players, seed + game_index // 2, opening_moves)
+        wins[names[winner - 1]] += 1
+        all_records.extend(records)
+
+        print(f"Game {game_index + 1}: {names[0]} vs {names[1]}, seed {seed + game_index // 2}, winner: {names[winner - 1]}")
+        for record in records:
+            print(f"  ply {record['ply']:2} {record['engine']:>14}: move {record['move']}, depth {record['depth']:2}, "
+                  f"{record['nodes']:7} nodes, {record['seconds']:.3f}s, {record['nps']:.0f} nodes/s")
+
+    print("Summary:")
+    for name in wins:
+        moves = [record for record in all_records if record["engine"] == name]
+        nodes = sum(record["nodes"] for record in moves)
+        seconds = sum(record["seconds"] for record in moves)
+        depth = sum(record["depth"] for record in moves) / len(moves) if moves else 0
+        print(f"  {name}: {wins[name]} wins, {len(moves)} moves, average depth {depth:.1f}, "
+              f"{nodes} nodes in {seconds:.1f}s, {nodes / seconds if seconds else 0:.0f} nodes/s")
+
+    if csv_file:
+        with open(csv_file, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=["seed", "ply", "engine", "player", "move", "depth", "nodes", "seconds", "nps"])
+            writer.writeheader()
+            writer.writerows(all_records)
+        print(f"Moves stored in {csv_file}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play seeded games between two engine configurations without a window.")
+    parser.add_argument("--first", choices=CONFIGS, default="default", help="configuration of the first engine")
+    parser.add_argument("--second", choices=CONFIGS, default="default", help="configuration of the second engine")
+    parser.add_argument("--games", type=int, default=2, help="number of games, the engines swap colours every game")
+    parser.add_argument("--seed", type=int, default=constants.SEED, help="seed of the random opening moves of the first game")
+    parser.add_argument("--time", type=float, default=constants.MOVE_TIME, help="seconds an engine may search a move")
+    parser.add_argument("--opening-moves", type=int, default=2, help="random moves played before the engines take over")
+    parser.add_argument("--csv", help="file to write every move to")
+    parser.add_argument("--stats", action="store_true", help="print the search statistics of every move")
+    parser.add_argument("--workers", type=int, default=constants.WORKERS, help="worker processes the root moves are split over")
+    parser.add_argument("--size", default=f"{constants.ROWS}x{constants.COLS}", help="board size as ROWSxCOLS")
+    arguments = parser.parse_args()
+    engine.set_board_size(*engine.parse_board_size(arguments.size))
+
+    self_play(arguments.first, arguments.second, arguments.games, arguments.seed, arguments.time, arguments.opening_moves, arguments.csv, arguments.stats, arguments.workers)
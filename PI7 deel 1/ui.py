@@ -0,0 +1,200 @@
+from __future__ import annotations
+import pygame
+import pygame.freetype
+import constants
+from engine import Game
+
+class BoardRenderer():
+    def __init__(self):
+        """
+        Draw the board with cached images and redraw only the squares that changed since the last frame.
+        The queen image is loaded, scaled and tinted once per colour, the empty checkerboard and the destroyed square
+        are drawn once to their own surfaces.
+        """
+        self.queens = {} #(player, tint) -> (the scaled and tinted queen image, the part of it that is not transparent)
+        self.background = None
+        self.destroyed = None
+        self.squares = {} #(x_axis, y_axis) -> what was drawn on the square in the last frame
+        
+    def queen(self, player: int, turn: int) -> tuple:
+        """
+        Get the queen image of a player, the queen of the player to move is red for player 1 and blue for player 2.
+        The image is loaded the first time the colour is needed.
+        
+        parameters:
+        - player (int): The player
+        - turn (int): The player to move
+
+        Returns:
+        - tuple: (image, bounds) where image is scaled to constants.QUEEN_SIZE and bounds is the part of it that is not transparent
+        """
+        tint = None
+        if player == constants.PLAYER1 and turn == constants.PLAYER1:
+            tint = constants.RED
+        elif player == constants.PLAYER2:
+            tint = constants.BLUE if turn == constants.PLAYER2 else constants.WHITE
+        if (player, tint) not in self.queens:
+            queen = pygame.transform.scale(pygame.image.load(constants.QUEEN), (constants.QUEEN_SIZE, constants.QUEEN_SIZE))
+            if tint is not None:
+                queen.fill(tint, special_flags=pygame.BLEND_RGB_MAX)
+            self.queens[player, tint] = (queen.convert_alpha(), queen.get_bounding_rect())
+        return self.queens[player, tint]
+    
+    def draw_background(self) -> pygame.Surface:
+        """
+        Get the empty checkerboard, it is drawn the first time it is needed.
+        
+        Returns:
+        - pygame.Surface: The checkerboard
+        """
+        if self.background is None:
+            self.background = pygame.Surface((constants.ROWS * constants.SQUARE_SIZE, constants.COLS * constants.SQUARE_SIZE))
+            for x_axis in range(constants.ROWS):
+                for y_axis in range(constants.COLS):
+                    color = constants.ALT_GRAY if (x_axis + y_axis) % 2 == constants.EMPTY else constants.GRAY #alternates colors
+                    pygame.draw.rect(self.background, color, (x_axis * constants.SQUARE_SIZE, y_axis * constants.SQUARE_SIZE, constants.SQUARE_SIZE, constants.SQUARE_SIZE))
+        return self.background
+    
+    def draw_destroyed(self) -> pygame.Surface:
+        """
+        Get the image of a destroyed square, it is drawn the first time it is needed.
+        The X is wider than the square, so the image has a transparent border of 3 pixels around the square.
+        
+        Returns:
+        - pygame.Surface: The destroyed square, blit it 3 pixels up and left of the square
+        """
+        if self.destroyed is None:
+            self.destroyed = pygame.Surface((constants.SQUARE_SIZE + 6, constants.SQUARE_SIZE + 6), pygame.SRCALPHA)
+            pygame.draw.rect(self.destroyed, constants.BLACK, (3, 3, constants.SQUARE_SIZE, constants.SQUARE_SIZE))
+            #draws an X on destroyed tiles
+            pygame.draw.line(self.destroyed, constants.RED, (3, 3), (3 + constants.SQUARE_SIZE, 3 + constants.SQUARE_SIZE), 5)
+            pygame.draw.line(self.destroyed, constants.RED, (3 + constants.SQUARE_SIZE, 3), (3, 3 + constants.SQUARE_SIZE), 5)
+        return self.destroyed
+    
+    def footprint(self, x_axis: int, y_axis: int, drawn: tuple) -> pygame.Rect:
+        """
+        Get the part of the screen that is covered by what is drawn on a square.
+        The queen image is larger than a square and the X on a destroyed square is wider than the square.
+        
+        parameters:
+        - x_axis (int): x_axis-coordinate of the square
+        - y_axis (int): y_axis-coordinate of the square
+        - drawn (tuple): What is drawn on the square, as stored in self.squares
+
+        Returns:
+        - pygame.Rect: The covered rect
+        """
+        rect = pygame.Rect(x_axis * constants.SQUARE_SIZE, y_axis * constants.SQUARE_SIZE, constants.SQUARE_SIZE, constants.SQUARE_SIZE)
+        square, turn, highlighted = drawn
+        if square == constants.DESTROYED:
+            rect = rect.inflate(6, 6)
+        elif square in (constants.PLAYER1, constants.PLAYER2):
+            rect = rect.union(self.queen(square, turn)[1].move(rect.topleft))
+        return rect
+        
+    def draw(self, game: Game, screen: pygame.Surface) -> list:
+        """
+        Draw the squares that changed since the last frame.
+        Every changed area is drawn in the same order as the whole board, clipped to the area, so overlapping images stay correct.
+        
+        parameters:
+        - game (Game): The game state
+        - screen (pygame.Surface): The screen to draw on
+
+        Returns:
+        - list: The rects of the screen that were drawn, empty if nothing changed
+        """
+        highlights = set(game.available_moves())
+        squares = {}
+        for x_axis in range(constants.ROWS):
+            for y_axis in range(constants.COLS):
+                square = game.get_square(x_axis, y_axis)
+                turn = game.turn if square in (constants.PLAYER1, constants.PLAYER2) else None
+                squares[x_axis, y_axis] = (square, turn, (x_axis, y_axis) in highlights)
+        
+        if not self.squares:
+            #fill the screen to wipe away anything from before
+            screen.fill("purple")
+            dirty = [screen.get_rect()]
+        else:
+            dirty = []
+            for position, drawn in squares.items():
+                if self.squares[position] != drawn:
+                    rect = self.footprint(*position, self.squares[position]).union(self.footprint(*position, drawn))
+                    #overlapping areas are drawn as one
+                    overlap = rect.collidelist(dirty)
+                    while overlap >= 0:
+                        rect.union_ip(dirty.pop(overlap))
+                        overlap = rect.collidelist(dirty)
+                    dirty.append(rect)
+        self.squares = squares
+        
+        background = self.draw_background()
+        destroyed = self.draw_destroyed()
+        for rect in dirty:
+            screen.set_clip(rect)
+            screen.blit(background, rect, rect)
+            
+            #draw players and destroyed tiles that reach into the area
+            for (x_axis, y_axis), drawn in squares.items():
+                if drawn[0] == constants.EMPTY or not rect.colliderect(self.footprint(x_axis, y_axis, drawn)):
+                    continue
+                if drawn[0] == constants.DESTROYED:
+                    screen.blit(destroyed, (x_axis * constants.SQUARE_SIZE - 3, y_axis * constants.SQUARE_SIZE - 3))
+                else:
+                    screen.blit(self.queen(drawn[0], drawn[1])[0], (x_axis * constants.SQUARE_SIZE, y_axis * constants.SQUARE_SIZE))
+            
+            #draws available moves for the current player with a semi-transparent green color
+            for (x_axis, y_axis), (square, turn, highlighted) in squares.items():
+                if highlighted:
+                    color = constants.SEMI_GREEN_ALT_GRAY if (x_axis + y_axis) % 2 == constants.EMPTY else constants.SEMI_GREEN_GRAY
+                    pygame.draw.rect(screen, color, (x_axis * constants.SQUARE_SIZE, y_axis * constants.SQUARE_SIZE, constants.SQUARE_SIZE, constants.SQUARE_SIZE))
+        screen.set_clip(None)
+        return dirty
+    
+    def invalidate(self) -> None:
+        """
+        Forget what is on the screen, so the next frame draws the whole board.
+        
+        Returns:
+        - None
+        """
+        self.squares = {}
+
+def draw_winner_on_screen(game, screen) -> None:
+    """
+    Draw the winner on the screen.
+    
+    Parameters:
+    - game (Game): The game state
+    - screen (pygame.Surface): The screen to draw on
+    
+    Returns:
+    - None
+    """    
+    GAME_FONT = pygame.freetype.SysFont("Arial", 50)
+    text_surface, rect = GAME_FONT.render(f"Black wins!" if game.winner == constants.PLAYER1 else "White wins!", constants.WHITE)
+    GAME_FONT.render_to(screen, (constants.WIDTH//2 - rect.width//2, constants.HEIGHT//2 - rect.height//2), f"Black wins!" if game.winner == constants.PLAYER1 else "White wins!", constants.WHITE)
+    pygame.display.flip()
+                
+def draw_screen(game, screen, renderer: BoardRenderer=None) -> None:
+    """
+    Draw the game screen.
+    
+    Parameters:
+    - game (Game): The game state
+    - screen (pygame.Surface): The screen to draw on
+    - renderer (BoardRenderer): The renderer that remembers what is on the screen, None to draw the whole screen
+    
+    Returns:
+    - None
+    """
+
+    # renders game board, only the squares that changed since the last frame
+    if renderer is None:
+        renderer = BoardRenderer()
+    dirty = renderer.draw(game, screen)
+    
+    # update() only puts the changed parts of the screen on the display
+    if dirty:
+        pygame.display.update(dirty)